@@ -52,6 +52,16 @@ VALID_RECIPES = {
 DEFAULT_RECIPES = frozenset({'disk', 'firmware', 'sysinfo'})
 ARTIFACT_MIN_REPORTING_SIZE = 1024**3
 
+# Divisors and suffixes, in increasing order, for each prefix system.
+_BYTE_UNITS = {
+    'bin': tuple(
+        (1024 ** i, suffix) for i, suffix in enumerate(
+            ('B', 'KiB', 'MiB', 'GiB', 'TiB', 'PiB'))),
+    'dec': tuple(
+        (1000 ** i, suffix) for i, suffix in enumerate(
+            ('B', 'KB', 'MB', 'GB', 'TB', 'PB'))),
+}
+
 def HumanReadableBytes(byte_val, prefix='dec'):
   """Converts a byte count into a human readable form in MB/MiB etc
 
@@ -61,18 +71,13 @@ def HumanReadableBytes(byte_val, prefix='dec'):
   Returns:
     str: A human-readable byte count.
   """
-
-  if prefix == 'bin':
-    kilo = 1024
-    suffixes = ['B', 'KiB', 'MiB', 'GiB', 'TiB', 'PiB']
-  elif prefix == 'dec':
-    kilo = 1000
-    suffixes = ['B', 'KB', 'MB', 'GB', 'TB', 'PB']
-
-  for i in range(0, 6):
-    if byte_val < kilo ** (i+1):
-      return '{:.1f} {:s}'.format(byte_val / kilo**i, suffixes[i])
-  return '{:.1f} {:s}'.format(byte_val / kilo**5, suffixes[5])
+  units = _BYTE_UNITS[prefix]
+  divisor, suffix = units[0]
+  for next_divisor, next_suffix in units[1:]:
+    if byte_val < next_divisor:
+      break
+    divisor, suffix = next_divisor, next_suffix
+  return '{:.1f} {:s}'.format(byte_val / divisor, suffix)
 
 
 class SpinnerBar(Spinner):
@@ -303,7 +308,7 @@ class AutoForensicate(object):
     parser.add_argument(
         '--disable_dcfldd', action='store_true', required=False,
         help=(
-            'Do not use dcfldd to acquire a disk, just read blocks '
+            'Do not hash a disk while acquiring it, just read blocks '
             '(this disable creation of hashlog files)')
     )
     parser.add_argument(
@@ -313,6 +318,13 @@ class AutoForensicate(object):
             'split the upload into the specified number of chunks.'
             '(this also sets --disable_dcfldd)')
     )
+    parser.add_argument(
+        '--slice_parallelism', required=False, type=int,
+        help=(
+            'The maximum number of slices uploaded at the same time when '
+            'using --slice_disks. Defaults to 8 for GCS destinations, and to '
+            '1 for local destinations.')
+    )
     parser.add_argument(
         '--method', action='store', required=False, choices=['tar'],
         default='tar',
@@ -378,6 +390,11 @@ class AutoForensicate(object):
     graphical_env = not options.no_zenity
     stamp_manager = manager.BaseStampManager(graphical=graphical_env)
 
+    # Each splitter uploader has its own default parallelism.
+    splitter_kwargs = {}
+    if options.slice_parallelism:
+      splitter_kwargs['parallelism'] = options.slice_parallelism
+
     if options.destination.startswith('gs://'):
       if not self._gcs_settings:
         raise errors.BadConfigOption(
@@ -395,7 +412,7 @@ class AutoForensicate(object):
       if options.slice_disks:
         return uploader.GCSSplitterUploader(
             options.destination, options.gs_keyfile, client_id, stamp_manager,
-            slices=options.slice_disks)
+            slices=options.slice_disks, **splitter_kwargs)
 
       return uploader.GCSUploader(
           options.destination, options.gs_keyfile, client_id, stamp_manager)
@@ -403,7 +420,8 @@ class AutoForensicate(object):
     if options.destination.startswith('/'):
       if options.slice_disks:
         return uploader.LocalSplitterCopier(
-            options.destination, stamp_manager, slices=options.slice_disks)
+            options.destination, stamp_manager, slices=options.slice_disks,
+            **splitter_kwargs)
       return uploader.LocalCopier(options.destination, stamp_manager)
 
     return None
@@ -441,9 +459,18 @@ class AutoForensicate(object):
         raise errors.BadConfigOption(
             '--slice_disks is selected but no disk is set to be uploaded')
 
-      # We don't support dcfldd when splitting a disk into multiple files
+      # We don't support hashing when splitting a disk into multiple files
       options.disable_dcfldd = True
 
+    if options.slice_parallelism is not None:
+      if not options.slice_disks:
+        raise errors.BadConfigOption(
+            '--slice_parallelism needs the --slice_disks option')
+
+      if options.slice_parallelism < 1:
+        raise errors.BadConfigOption(
+            '--slice_parallelism option should be at least 1')
+
     if not options.no_zenity:
       # force no_zenity to True if zenity is not installed
       zenity_path = hostinfo.Which('zenity')
@@ -16,6 +16,7 @@
 
 from __future__ import unicode_literals
 
+import functools
 import os
 import subprocess
 import time
@@ -119,7 +120,22 @@ def Which(cmd):
   Returns:
     str: the first found path to a binary with the same name, or None.
   """
-  path_list = os.environ.get('PATH', os.defpath).split(os.pathsep)
+  return _WhichInPath(cmd, os.environ.get('PATH', os.defpath))
+
+
+@functools.lru_cache(maxsize=None)
+def _WhichInPath(cmd, path):
+  """Searches for a binary in a list of directories.
+
+  Results are cached, as the same binaries are looked up many times.
+
+  Args:
+    cmd(str): the binary to search for.
+    path(str): the list of directories to search, separated by os.pathsep.
+  Returns:
+    str: the first found path to a binary with the same name, or None.
+  """
+  path_list = path.split(os.pathsep)
   for directory in path_list:
     name = os.path.join(directory, cmd)
     if os.path.isdir(name):
@@ -219,17 +219,32 @@ class ProcessOutputArtifact(BaseArtifact):
       self._logger.info('Command %s terminated.', self._command)
       self._logger.debug('stderr : \'%s\'', error.strip())
     else:
-      command_output = (
-          'Command \'{0!s}\' failed with \'{1!s}\' return code {2:d})'.format(
-              self._command, error.strip(), process.returncode))
-      self._logger.error(command_output)
-      command_output = command_output.encode()
-      if not self._ignore_failure:
-        raise errors.RecipeException(
-            'Error running ProcessOutputArtifact command')
+      command_output = self._GetFailureOutput(error, process.returncode)
 
     return command_output
 
+  def _GetFailureOutput(self, error, returncode):
+    """Handles a failure of the command.
+
+    Args:
+      error (bytes): what the command wrote to stderr.
+      returncode (int): the return code of the command.
+
+    Returns:
+      bytes: the error message, to upload instead of the command output.
+
+    Raises:
+      errors.RecipeException: if the failure should not be ignored.
+    """
+    command_output = (
+        'Command \'{0!s}\' failed with \'{1!s}\' return code {2:d})'.format(
+            self._command, error.strip(), returncode))
+    self._logger.error(command_output)
+    if not self._ignore_failure:
+      raise errors.RecipeException(
+          'Error running ProcessOutputArtifact command')
+    return command_output.encode()
+
   def _GetStream(self):
     """Get the file-like object to the data of the artifact.
 
@@ -243,6 +258,40 @@ class ProcessOutputArtifact(BaseArtifact):
     return self._buffered_content
 
 
+class FileBackedProcessOutputArtifact(ProcessOutputArtifact):
+  """Class for an artifact to upload the potentially large output of a command.
+
+  The command writes its output directly to a temporary file, instead of it
+  going through a pipe and being kept in memory.
+  """
+
+  def _GetStream(self):
+    """Get the file-like object to the data of the artifact.
+
+    Returns:
+      file: Read-only file-like object to the data.
+    """
+    if not self._buffered_content:
+      output_file = tempfile.TemporaryFile()
+      process = subprocess.Popen(
+          self._command, stdout=output_file, stderr=subprocess.PIPE)
+      self._logger.info('Running command \'%s\'', self._command)
+      _, error = process.communicate()
+
+      if process.returncode == 0:
+        self._logger.info('Command %s terminated.', self._command)
+        self._logger.debug('stderr : \'%s\'', error.strip())
+        self._size = os.fstat(output_file.fileno()).st_size
+        output_file.seek(0)
+        self._buffered_content = output_file
+      else:
+        output_file.close()
+        command_output = self._GetFailureOutput(error, process.returncode)
+        self._size = len(command_output)
+        self._buffered_content = io.BytesIO(command_output)
+    return self._buffered_content
+
+
 class BaseRecipe(object):
   """BaseRecipe class."""
 
@@ -16,9 +16,15 @@
 
 from __future__ import unicode_literals
 
+from concurrent import futures
+import hashlib
+import io
 import json
+import logging
 import os
+import queue
 import subprocess
+import threading
 
 from auto_forensicate import errors
 from auto_forensicate import hostinfo
@@ -27,19 +33,322 @@ from auto_forensicate.recipes import base
 from auto_forensicate.ux import cli
 from auto_forensicate.ux import gui
 
+# Names of the udev properties used to describe and classify Linux disks.
+_UDEV_ID_BUS = 'ID_BUS'
+_UDEV_ID_MODEL = 'ID_MODEL'
+_UDEV_ID_SERIAL = 'ID_SERIAL'
+_UDEV_ID_VENDOR = 'ID_VENDOR'
+_UDEV_MAJOR = 'MAJOR'
+_UDEV_TEXT_OUTPUT = 'udevadm_text_output'
+
+
+class HashingReader(io.RawIOBase):
+  """A read-only raw stream computing hashes of the data read from a device.
+
+  MD5 and SHA1 hashes are computed for every hash window, as well as for the
+  whole content, and are written to a hashlog file in the same format as
+  dcfldd's.
+  """
+
+  _HASH_ALGORITHMS = ('md5', 'sha1')
+  _SECTOR_SIZE = 512
+
+  def __init__(self, path, size, hashlog_filename, hash_window):
+    """Initializes a HashingReader object.
+
+    Args:
+      path(str): the path to the device to read.
+      size(int): the size of the device, in bytes.
+      hashlog_filename(str): where to store the hashes.
+      hash_window(int): the size, in bytes, of the hash windows.
+    """
+    super(HashingReader, self).__init__()
+    self._file = open(path, 'rb', buffering=0)
+    self._hash_window = hash_window
+    self._hashing_pool = futures.ThreadPoolExecutor(
+        max_workers=len(self._HASH_ALGORITHMS))
+    self._hashlog_filename = hashlog_filename
+    self._hashlog_lines = []
+    self._logger = logging.getLogger(self.__class__.__name__)
+    self._offset = 0
+    self._size = size
+    self._total_hashes = self._NewHashes()
+    self._window_hashes = self._NewHashes()
+    self._window_start = 0
+    self._Advise(0, 0, 'POSIX_FADV_SEQUENTIAL')
+
+  def _Advise(self, offset, length, advice):
+    """Declares an access pattern for a range of the device to the kernel.
+
+    This is a no-op on systems without posix_fadvise(), such as macOS.
+
+    Args:
+      offset(int): the start of the range.
+      length(int): the length of the range, 0 meaning up to the end.
+      advice(str): the name of the os.POSIX_FADV_* constant to use.
+    """
+    if not hasattr(os, 'posix_fadvise') or self._file.closed:
+      return
+    try:
+      os.posix_fadvise(
+          self._file.fileno(), offset, length, getattr(os, advice))
+    except OSError as e:
+      self._logger.debug('Could not call posix_fadvise(): %s', e)
+
+  def _NewHashes(self):
+    """Returns a list of new hash objects, one per hash algorithm."""
+    return [hashlib.new(algorithm) for algorithm in self._HASH_ALGORITHMS]
+
+  def _CloseWindow(self):
+    """Records the hashes of the current window and starts a new one."""
+    for hash_object in self._window_hashes:
+      self._hashlog_lines.append('{0:d} - {1:d}: {2:s}\n'.format(
+          self._window_start, self._offset, hash_object.hexdigest()))
+    # Every byte is only read once, so there is no point keeping this window
+    # in the page cache, where it would evict more useful data.
+    self._Advise(
+        self._window_start, self._offset - self._window_start,
+        'POSIX_FADV_DONTNEED')
+    self._window_hashes = self._NewHashes()
+    self._window_start = self._offset
+
+  def _UpdateHashes(self, data):
+    """Updates the hashes with data read from the device.
+
+    Args:
+      data(memoryview): the data read.
+    """
+    while data:
+      window_end = self._window_start + self._hash_window
+      chunk = data[:window_end - self._offset]
+      # hashlib releases the GIL while hashing large buffers, so each algorithm
+      # can run in its own thread.
+      pending_updates = [
+          self._hashing_pool.submit(
+              self._UpdateHashObjects, hash_objects, chunk)
+          for hash_objects in zip(self._window_hashes, self._total_hashes)]
+      for pending_update in pending_updates:
+        pending_update.result()
+      self._offset += len(chunk)
+      data = data[len(chunk):]
+      if self._offset == window_end:
+        self._CloseWindow()
+
+  @staticmethod
+  def _UpdateHashObjects(hash_objects, data):
+    """Updates hash objects with the same data.
+
+    Args:
+      hash_objects(list(hashlib.hash)): the hash objects to update.
+      data(memoryview): the data read.
+    """
+    for hash_object in hash_objects:
+      hash_object.update(data)
+
+  def close(self):
+    """Closes the device."""
+    self._hashing_pool.shutdown()
+    self._file.close()
+    super(HashingReader, self).close()
+
+  def readable(self):
+    """Returns True, as this stream supports reading."""
+    return True
+
+  def _ReadSectors(self, buffer_view):
+    """Reads data from the device one sector at a time.
+
+    This is used after a read error, so that only the sectors that can't be
+    read are replaced with zeros.
+
+    Args:
+      buffer_view(memoryview): the buffer to read into.
+
+    Returns:
+      int: the number of bytes read, 0 on EOF.
+
+    Raises:
+      OSError: if a sector past the expected end of the device can't be read.
+    """
+    read_size = 0
+    while read_size < len(buffer_view):
+      sector_offset = self._offset + read_size
+      sector_view = buffer_view[read_size:read_size + self._SECTOR_SIZE]
+      self._file.seek(sector_offset)
+      try:
+        sector_read_size = self._file.readinto(sector_view)
+      except OSError as e:
+        # Past the expected end of the device there is nothing to preserve the
+        # offsets of, and zero-filling could go on forever.
+        sector_read_size = min(len(sector_view), self._size - sector_offset)
+        if sector_read_size <= 0:
+          raise
+        self._logger.error(
+            'Error reading sector at offset %d, replacing it with zeros: %s',
+            sector_offset, e)
+        sector_view[:sector_read_size] = bytes(sector_read_size)
+      if not sector_read_size:
+        break
+      read_size += sector_read_size
+    self._file.seek(self._offset + read_size)
+    return read_size
+
+  def readinto(self, b):
+    """Reads data from the device into a pre-allocated buffer.
+
+    Read errors don't stop the acquisition: the range that failed is read
+    again one sector at a time, and only the unreadable sectors are replaced
+    with zeros, so that offsets in the image still match the device's.
+
+    Args:
+      b(bytearray): the buffer to read into.
+
+    Returns:
+      int: the number of bytes read, 0 on EOF.
+    """
+    buffer_view = memoryview(b).cast('B')
+    try:
+      read_size = self._file.readinto(buffer_view)
+    except OSError as e:
+      self._logger.error(
+          'Error reading %d bytes at offset %d, retrying each sector: %s',
+          len(buffer_view), self._offset, e)
+      read_size = self._ReadSectors(buffer_view)
+    self._UpdateHashes(buffer_view[:read_size])
+    return read_size
+
+  def WriteHashlog(self):
+    """Writes the computed hashes to the hashlog file.
+
+    Returns:
+      str: the hashes of the whole device, as written in the hashlog.
+    """
+    if self._offset > self._window_start:
+      self._CloseWindow()
+    total_hashes = ''.join(
+        '\nTotal ({0:s}): {1:s}\n'.format(
+            hash_object.name, hash_object.hexdigest())
+        for hash_object in self._total_hashes)
+    with open(self._hashlog_filename, 'w') as hashlog:
+      hashlog.writelines(self._hashlog_lines)
+      hashlog.write(total_hashes)
+    return total_hashes
+
+
+class ReadAheadReader(io.RawIOBase):
+  """A read-only raw stream reading blocks from another stream in a thread.
+
+  This lets the reading (and hashing) of the next blocks of a disk happen while
+  the previous ones are being uploaded. At most queue_size blocks are kept in
+  memory.
+  """
+
+  def __init__(self, stream, block_size, queue_size):
+    """Initializes a ReadAheadReader object.
+
+    Args:
+      stream(file): the file-like object to read blocks from.
+      block_size(int): the size, in bytes, of the blocks to read.
+      queue_size(int): the maximum number of blocks read in advance.
+    """
+    super(ReadAheadReader, self).__init__()
+    self._block_size = block_size
+    self._current_block = memoryview(b'')
+    self._eof = False
+    self._error = None
+    self._position = 0
+    self._queue = queue.Queue(maxsize=queue_size)
+    self._stop_event = threading.Event()
+    self._stream = stream
+    self._thread = threading.Thread(target=self._ReadBlocks, daemon=True)
+    self._thread.start()
+
+  def _ReadBlocks(self):
+    """Reads blocks from the stream until EOF, and puts them in the queue.
+
+    An empty block is used to signal EOF, while an exception is passed along
+    to be raised in the reading thread.
+    """
+    try:
+      while not self._stop_event.is_set():
+        block = self._stream.read(self._block_size)
+        self._queue.put(block)
+        if not block:
+          return
+    except Exception as e:  # pylint: disable=broad-except
+      self._queue.put(e)
+
+  def close(self):
+    """Stops the reading thread and closes the stream."""
+    if not self.closed:
+      self._stop_event.set()
+      while self._thread.is_alive():
+        # Make room in the queue, in case the thread is waiting on it.
+        try:
+          self._queue.get(timeout=0.1)
+        except queue.Empty:
+          pass
+      self._stream.close()
+    super(ReadAheadReader, self).close()
+
+  def readable(self):
+    """Returns True, as this stream supports reading."""
+    return True
+
+  def readinto(self, b):
+    """Reads data from the queued blocks into a pre-allocated buffer.
+
+    Args:
+      b(bytearray): the buffer to read into.
+
+    Returns:
+      int: the number of bytes read, 0 on EOF.
+
+    Raises:
+      Exception: any exception raised while reading the stream.
+    """
+    if not self._current_block:
+      if self._error:
+        raise self._error
+      if self._eof:
+        return 0
+      block = self._queue.get()
+      if isinstance(block, Exception):
+        # The reading thread has stopped, so nothing else will be queued.
+        self._error = block
+        raise block
+      if not block:
+        self._eof = True
+        return 0
+      self._current_block = memoryview(block)
+
+    buffer_view = memoryview(b).cast('B')
+    read_size = min(len(buffer_view), len(self._current_block))
+    buffer_view[:read_size] = self._current_block[:read_size]
+    self._current_block = self._current_block[read_size:]
+    self._position += read_size
+    return read_size
+
+  def tell(self):
+    """Returns the number of bytes read from this stream so far."""
+    return self._position
+
 
 class DiskArtifact(base.BaseArtifact):
   """The DiskArtifact class.
 
   Attributes:
-    hashlog_filename (str): where dcfldd will store the hashes.
+    hashlog_filename (str): where the hashes of the disk will be stored.
     name (str): the name of the artifact.
     remote_path (str): the path to the artifact in the remote storage.
     size (int): the size of the artifact, in bytes.
   """
 
-  _DD_BINARY = 'dcfldd'
-  _DD_OPTIONS = ['hash=md5,sha1', 'bs=2M', 'conv=noerror', 'hashwindow=128M']
+  _HASH_WINDOW_SIZE = 128 * 1024 * 1024
+  _READ_AHEAD_BLOCKS = 4
+  # HashingReader retries a failed block one sector at a time, so the block
+  # size doesn't bound how much data is replaced with zeros on read errors.
+  _READ_BUFFER_SIZE = 8 * 1024 * 1024
 
   def __init__(self, path, size, mounted=False, use_dcfldd=True):
     """Initializes a DiskArtifact object.
@@ -50,7 +359,8 @@ class DiskArtifact(base.BaseArtifact):
       path(str): the path to the disk.
       size(str): the size of the disk.
       mounted(bool): whether the disk has a mounted partition.
-      use_dcfldd(bool): whether to use dcfldd to read from the blockdevice.
+      use_dcfldd(bool): whether to hash the blockdevice while reading it, and
+        generate a dcfldd style hashlog file.
 
     Raises:
       ValueError: if path is none, doesn't start with '/dev' or size is =< 0.
@@ -59,7 +369,7 @@ class DiskArtifact(base.BaseArtifact):
     if not path.startswith('/dev'):
       raise ValueError(
           'Error with path {0:s}: should start with \'/dev\''.format(path))
-    self._ddprocess = None
+    self._hashing_reader = None
     self.mounted = mounted
     self.use_dcfldd = use_dcfldd
     self._path = path
@@ -70,22 +380,6 @@ class DiskArtifact(base.BaseArtifact):
     self.hashlog_filename = '{0:s}.hash'.format(self.name)
     self.remote_path = 'Disks/{0:s}.image'.format(self.name)
 
-  def _GenerateDDCommand(self):
-    """Builds the DD command to run on the disk.
-
-    Returns:
-      list: the argument list for the dd command
-    """
-    dd_binary = hostinfo.Which(self._DD_BINARY)
-    if not dd_binary:
-      raise errors.RecipeException(
-          'Could not find \'{0:s}\''.format(self._DD_BINARY))
-    command = [
-        dd_binary, 'if={0:s}'.format(self._path),
-        'hashlog={0:s}'.format(self.hashlog_filename)]
-    command.extend(self._DD_OPTIONS)
-    return command
-
   def _GetStream(self):
     """Get the file-like object to the data of the artifact.
 
@@ -96,14 +390,16 @@ class DiskArtifact(base.BaseArtifact):
       IOError: If this method is called more than once before CloseStream().
     """
     if self.use_dcfldd:
-      if self._ddprocess is None:
-        command = self._GenerateDDCommand()
-        self._logger.info('Opening disk with command \'{0!s}\''.format(command))
-        self._ddprocess = subprocess.Popen(
-            command, stdin=None, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+      if self._hashing_reader is None:
+        self._logger.info('Opening disk %s', self._path)
+        self._hashing_reader = HashingReader(
+            self._path, self.size, self.hashlog_filename,
+            self._HASH_WINDOW_SIZE)
       else:
         raise IOError('Disk is already opened')
-      return self._ddprocess.stdout
+      return ReadAheadReader(
+          self._hashing_reader, self._READ_BUFFER_SIZE,
+          self._READ_AHEAD_BLOCKS)
     else:
       self._stream = open(self._path, 'rb')
       return self._stream
@@ -112,35 +408,29 @@ class DiskArtifact(base.BaseArtifact):
     """Closes the file-like object.
 
     Returns:
-      str: a return message for the report.
+      str: a return message for the report, with the hashes of the whole disk,
+        or None if the disk wasn't hashed.
 
     Raises:
-      errors.RecipeException: if the dcfldd process returns with an error.
+      errors.RecipeException: if the disk hasn't been read entirely.
       IOError: if CloseStream() is called before GetStream().
     """
     if not self.use_dcfldd:
       self._stream.close()
+      return None
     else:
-      if not self._ddprocess:
+      if not self._hashing_reader:
         raise IOError('Illegal call to CloseStream() before GetStream()')
 
-      # If there is anything still to read from the subprocess then CloseStream
-      # has been called early, terminate the child process to avoid deadlock.
-      c = self._ddprocess.stdout.read(1)
-      if c:
-        # TODO log this
-        self._ddprocess.terminate()
+      # If the disk hasn't been read up to its end then CloseStream has been
+      # called early, and the hashes don't cover the whole disk.
+      read_size = self._stream.tell()
+      self._stream.close()
+      if read_size < self.size:
         raise errors.RecipeException(
-            'CloseStream() called but stdout still had data')
+            'CloseStream() called but the disk still had data')
 
-      self._ddprocess.wait()
-      code = self._ddprocess.returncode
-      error = self._ddprocess.stderr.read()
-      if code > 0:
-        raise errors.RecipeException(
-            'Command dcfldd returned non-zero exit status {0:d}, '
-            'with error: "{1:s}"'.format(code, error.decode()))
-      return error
+      return self._hashing_reader.WriteHashlog()
 
   def GetDescription(self):
     """Get a human readable description about the device.
@@ -162,25 +452,28 @@ class MacDiskArtifact(DiskArtifact):
   """The MacDiskArtifact class.
 
   Attributes:
-    hashlog_filename (str): where dcfldd will store the hashes.
+    hashlog_filename (str): where the hashes of the disk will be stored.
     name (str): the name of the artifact.
     remote_path (str): the path to the artifact in the remote storage.
     size (int): the size of the artifact, in bytes.
   """
 
-  def __init__(self, path, size, use_dcfldd=True):
+  def __init__(self, path, size, use_dcfldd=True, mac_disk=None):
     """Initializes a MacDiskArtifact object.
 
     Args:
       path(str): the path to the disk.
       size(str): the size of the disk.
-      use_dcfldd(bool): whether to use dcfldd to read from the blockdevice.
+      use_dcfldd(bool): whether to hash the blockdevice while reading it, and
+        generate a dcfldd style hashlog file.
+      mac_disk(macdisk.Disk): the already queried disk object, if any. If None,
+        diskutil will be called to get information about the disk.
 
     Raises:
       ValueError: if path is none, doesn't start with '/dev' or size is =< 0.
     """
     super(MacDiskArtifact, self).__init__(path, size, use_dcfldd=use_dcfldd)
-    self._macdisk = macdisk.Disk(self.name)
+    self._macdisk = mac_disk or macdisk.Disk(self.name)
 
   def _IsUsb(self):
     """Whether this device is connected on USB."""
@@ -205,7 +498,7 @@ class LinuxDiskArtifact(DiskArtifact):
   """The DiskArtifact class.
 
   Attributes:
-    hashlog_filename (str): where dcfldd will store the hashes.
+    hashlog_filename (str): where the hashes of the disk will be stored.
     name (str): the name of the artifact.
     remote_path (str): the path to the artifact in the remote storage.
     size (int): the size of the artifact, in bytes.
@@ -218,7 +511,8 @@ class LinuxDiskArtifact(DiskArtifact):
       path(str): the path to the disk.
       size(str): the size of the disk.
       mounted(bool): whether the disk has a mounted partition.
-      use_dcfldd(bool): whether to use dcfldd to read from the blockdevice.
+      use_dcfldd(bool): whether to hash the blockdevice while reading it, and
+        generate a dcfldd style hashlog file.
 
     Raises:
       ValueError: if path is none, doesn't start with '/dev' or size is =< 0.
@@ -234,14 +528,15 @@ class LinuxDiskArtifact(DiskArtifact):
     Returns:
       str: the description
     """
-    model = self._GetUdevadmProperty('ID_MODEL')
+    model = self._GetUdevadmProperty(_UDEV_ID_MODEL)
     if self._IsFloppy():
       model = 'Floppy Disk'
     if not model:
-      model = self._GetUdevadmProperty('ID_SERIAL') or '(no serial)'
+      model = self._GetUdevadmProperty(_UDEV_ID_SERIAL) or '(no serial)'
     connection = '(internal)'
     if self._IsUsb():
-      model = '{0:s} {1:s}'.format(self._GetUdevadmProperty('ID_VENDOR'), model)
+      model = '{0:s} {1:s}'.format(
+          self._GetUdevadmProperty(_UDEV_ID_VENDOR), model)
       connection = '(usb)'
     description = '{0:s}: {1:s} {2:s}'.format(self.name, model, connection)
     if self.mounted:
@@ -257,7 +552,7 @@ class LinuxDiskArtifact(DiskArtifact):
     Returns:
       str: the value of the property or None if the property is not set.
     """
-    if not self._udevadm_metadata:
+    if self._udevadm_metadata is None:
       self._udevadm_metadata = hostinfo.GetUdevadmInfo(self.name)
     return self._udevadm_metadata.get(prop, None)
 
@@ -273,11 +568,11 @@ class LinuxDiskArtifact(DiskArtifact):
   def _IsFloppy(self):
     """Whether this block device is a floppy disk."""
     # see https://www.kernel.org/doc/html/latest/admin-guide/devices.html
-    return self._GetUdevadmProperty('MAJOR') == '2'
+    return self._GetUdevadmProperty(_UDEV_MAJOR) == '2'
 
   def _IsUsb(self):
     """Whether this device is connected on USB."""
-    return self._GetUdevadmProperty('ID_BUS') == 'usb'
+    return self._GetUdevadmProperty(_UDEV_ID_BUS) == 'usb'
 
 
 class DiskRecipe(base.BaseRecipe):
@@ -289,18 +584,38 @@ class DiskRecipe(base.BaseRecipe):
   def __init__(self, name, options=None):
     """Class for a disks acquisition Recipe"""
     self.use_dcfldd = True
+    self._lsblk_dict = None
+    self._mac_disks = None
     super().__init__(name, options=options)
 
   def _GetLsblkDict(self):
     """Calls lsblk.
 
+    The output is only parsed once per recipe, as it is used both to list the
+    disks and to generate the lsblk artifact.
+
     Returns:
       dict: the output of the lsblk command.
     """
-    lsblk_path = hostinfo.Which('lsblk')
-    lsblk_output = subprocess.check_output(
-        [lsblk_path, '-J', '--bytes', '-o', '+UUID,FSTYPE,SERIAL'])
-    return json.loads(lsblk_output)
+    if self._lsblk_dict is None:
+      lsblk_path = hostinfo.Which('lsblk')
+      lsblk_output = subprocess.check_output(
+          [lsblk_path, '-J', '--bytes', '-o', '+UUID,FSTYPE,SERIAL'])
+      self._lsblk_dict = json.loads(lsblk_output)
+    return self._lsblk_dict
+
+  def _GetMacDisks(self):
+    """Calls diskutil to list all whole disks.
+
+    As every disk requires its own diskutil call, this is only done once per
+    recipe.
+
+    Returns:
+      list(macdisk.Disk): the whole disks connected to the machine.
+    """
+    if self._mac_disks is None:
+      self._mac_disks = macdisk.WholeDisks()
+    return self._mac_disks
 
   def _ListAllDisksMac(self):
     """Lists all disks connected to the machine.
@@ -309,12 +624,12 @@ class DiskRecipe(base.BaseRecipe):
       list(MacDiskArtifact): a list of disks.
     """
     disk_list = []
-    for mac_disk in macdisk.WholeDisks():
+    for mac_disk in self._GetMacDisks():
       disk_name = mac_disk.deviceidentifier
       disk_size = mac_disk.totalsize
       disk = MacDiskArtifact(
           os.path.join('/dev', disk_name), disk_size,
-          use_dcfldd=self.use_dcfldd)
+          use_dcfldd=self.use_dcfldd, mac_disk=mac_disk)
       disk_list.append(disk)
     return disk_list
 
@@ -375,13 +690,15 @@ class DiskRecipe(base.BaseRecipe):
     else:
       disk_list = self._ListAllDisksLinux()
 
-    # We order the list by size, descending.
-    disk_list = sorted(disk_list, reverse=True, key=lambda disk: disk.size)
     if names:
-      return [disk for disk in disk_list if disk.name in names]
-    if not all_devices:
+      names = set(names)
+      disk_list = [disk for disk in disk_list if disk.name in names]
+    elif not all_devices:
       # We resort to guessing
-      return [disk for disk in disk_list if disk.ProbablyADisk()]
+      disk_list = [disk for disk in disk_list if disk.ProbablyADisk()]
+
+    # We order the list by size, descending.
+    disk_list.sort(reverse=True, key=lambda disk: disk.size)
     return disk_list
 
   def _GetListDisksArtifact(self):
@@ -394,7 +711,7 @@ class DiskRecipe(base.BaseRecipe):
       #pylint: disable=protected-access
       diskutil_artifact = base.StringArtifact(
           'Disks/diskutil.txt', json.dumps(
-              [md._attributes for md in macdisk.WholeDisks()]))
+              [md._attributes for md in self._GetMacDisks()]))
       return diskutil_artifact
 
     lsblk_artifact = base.StringArtifact(
@@ -417,7 +734,7 @@ class DiskRecipe(base.BaseRecipe):
     #pylint: disable=protected-access
     udevadm_artifact = base.StringArtifact(
         'Disks/{0:s}.udevadm.txt'.format(disk.name),
-        disk._GetUdevadmProperty('udevadm_text_output'))
+        disk._GetUdevadmProperty(_UDEV_TEXT_OUTPUT))
     return udevadm_artifact
 
   def GetArtifacts(self):
@@ -435,7 +752,7 @@ class DiskRecipe(base.BaseRecipe):
     artifacts = []
     disks_to_collect = []
     if getattr(self._options, 'disable_dcfldd', None):
-      self._logger.info('Disabling dcfldd')
+      self._logger.info('Disabling disk hashing')
       self.use_dcfldd = False
 
     if getattr(self._options, 'select_disks', None):
@@ -465,7 +782,7 @@ class DiskRecipe(base.BaseRecipe):
 
       if self.use_dcfldd:
         # It is necessary for the DiskArtifact to be appended before the
-        # hashlog, as the hashlog is generated when dcfldd completes.
+        # hashlog, as the hashlog is generated when the disk stream is closed.
         hashlog_artifact = base.FileArtifact(disk.hashlog_filename)
         hashlog_artifact.remote_path = 'Disks/{0:s}'.format(
             hashlog_artifact.name)
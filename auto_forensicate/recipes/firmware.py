@@ -38,6 +38,6 @@ class ChipsecRecipe(base.BaseRecipe):
     # Firmware acquisition will fail on various platforms (ie: QEMU during e2e
     # tests, and shouldn't be a reason to mark the full upload as failed.
     # So we're setting ignore_failure to True.
-    firmware_artifact = base.ProcessOutputArtifact(
+    firmware_artifact = base.FileBackedProcessOutputArtifact(
         self._CHIPSEC_CMD, 'Firmware/rom.bin', ignore_failure=True)
     return [firmware_artifact]
@@ -17,11 +17,13 @@
 from __future__ import unicode_literals
 
 import argparse
+from concurrent import futures
 import itertools
 import json
 import logging
 import mmap
 import os
+import threading
 try:
   from BytesIO import BytesIO
 except ImportError:
@@ -110,9 +112,146 @@ class BaseUploader(object):
     return remote_path
 
 
+class SlicedUploadProgress(object):
+  """Aggregates the progress of slices of an artifact uploaded in parallel."""
+
+  def __init__(self, total_size, update_callback=None):
+    """Initializes a SlicedUploadProgress object.
+
+    Args:
+      total_size (int): the size of the whole artifact.
+      update_callback (func): an optional function called with the cumulated
+        number of bytes uploaded for all slices, and the total size.
+    """
+    self._lock = threading.Lock()
+    self._slices_uploaded = {}
+    self._total_size = total_size
+    self._update_callback = update_callback
+
+  def GetSliceCallback(self, slice_num):
+    """Returns a function to be called as the upload of a slice progresses.
+
+    Args:
+      slice_num (int): the number of the slice.
+
+    Returns:
+      func: the callback for the slice.
+    """
+    def _SliceCallback(current_bytes, _unused_total_bytes):
+      with self._lock:
+        self._slices_uploaded[slice_num] = current_bytes
+        if self._update_callback:
+          self._update_callback(
+              sum(self._slices_uploaded.values()), self._total_size)
+    return _SliceCallback
+
+
+def _GetSlices(size, slices, base_remote_path):
+  """Computes the boundaries of the slices of an artifact.
+
+  Args:
+    size (int): the size of the artifact.
+    slices (int): the number of slices to split the artifact into.
+    base_remote_path (str): the remote path of the artifact. Slices are
+      uploaded to this path, suffixed with the slice number.
+
+  Returns:
+    list(tuple(int, int, int, str)): the number, offset, size and remote path
+      of every slice.
+
+  Raises:
+    errors.BadConfigOption: if the number of slices is invalid.
+  """
+  if slices < 1:
+    raise errors.BadConfigOption(
+        'The number of slices needs to be greater than 1')
+
+  # mmap requires that the an offset is a multiple of mmap.PAGESIZE
+  # so we can't just equally divide the total size in the specified number
+  # of slices.
+  number_of_pages = max(1, int(size / slices /  mmap.PAGESIZE))
+
+  slice_size = number_of_pages * mmap.PAGESIZE
+  # slice_size might not be equal to (total_size / slices)
+
+  return [
+      (slice_num, offset, min(slice_size, size - offset),
+       f'{base_remote_path}_{slice_num}')
+      for slice_num, offset in enumerate(range(0, size, slice_size))]
+
+
+def _UploadSlices(
+    upload_function, artifact, base_remote_path, slices, max_workers,
+    update_callback=None):
+  """Uploads a DiskArtifact as multiple slices, up to max_workers at once.
+
+  Args:
+    upload_function (func): the function to upload one slice, with the same
+      arguments as BaseUploader._UploadStream().
+    artifact (DiskArtifact): the disk to upload.
+    base_remote_path (str): the remote path of the artifact. Slices are
+      uploaded to this path, suffixed with the slice number.
+    slices (int): the number of slices to split the artifact into.
+    max_workers (int): the maximum number of slices to upload at once.
+    update_callback (func): an optional function called as upload progresses.
+
+  Returns:
+    str: the remote destination of the last slice.
+
+  Raises:
+    errors.BadConfigOption: if the number of slices is invalid.
+  """
+  slice_list = _GetSlices(artifact.size, slices, base_remote_path)
+
+  stream = artifact.OpenStream()
+  progress = SlicedUploadProgress(artifact.size, update_callback)
+
+  def _UploadSlice(slice_info):
+    slice_num, offset, slice_size, remote_path = slice_info
+    # Every slice gets its own mmap object, so they can be read concurrently.
+    mmap_slice = mmap.mmap(
+        stream.fileno(), length=slice_size, offset=offset,
+        access=mmap.ACCESS_READ)
+    if hasattr(mmap, 'MADV_SEQUENTIAL'):
+      # Slices are read once, from start to end, so the kernel can read
+      # ahead more aggressively, and free pages that have already been read.
+      mmap_slice.madvise(mmap.MADV_SEQUENTIAL)
+    try:
+      upload_function(
+          mmap_slice, remote_path,
+          update_callback=progress.GetSliceCallback(slice_num))
+    finally:
+      mmap_slice.close()
+    if hasattr(os, 'posix_fadvise'):
+      # The slice won't be read again, don't let it evict more useful pages
+      # from the page cache.
+      os.posix_fadvise(
+          stream.fileno(), offset, slice_size, os.POSIX_FADV_DONTNEED)
+    return remote_path
+
+  with futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+    slice_uploads = [
+        executor.submit(_UploadSlice, slice_info) for slice_info in slice_list]
+    done, not_done = futures.wait(
+        slice_uploads, return_when=futures.FIRST_EXCEPTION)
+    # Don't start uploading the remaining slices if one of them failed. The
+    # ones already running are waited for when leaving this block.
+    for slice_upload in not_done:
+      slice_upload.cancel()
+
+  for slice_upload in slice_uploads:
+    if slice_upload in done and slice_upload.exception():
+      raise slice_upload.exception()
+
+  return slice_uploads[-1].result()
+
+
 class LocalCopier(BaseUploader):
   """Handles uploads of data to a local directory."""
 
+  _COPY_BUFFER_SIZE = 1024 * 1024
+  _SENDFILE_MAX_SIZE = 1024 * 1024 * 1024
+
   def __init__(self, destination_dir, stamp_manager, stamp=None):
     """Initializes the LocalCopier class.
 
@@ -134,17 +273,81 @@ class LocalCopier(BaseUploader):
       remote_path (str): the remote path to store the data to.
       update_callback (func): an optional function called as upload progresses.
     """
-    destination_file = open(remote_path, 'wb')
-    copied = 0
-    buffer_length = 16*1024  # This is the defaults for shutil.copyfileobj()
+    with open(remote_path, 'wb') as destination_file:
+      if self._SendFile(stream, destination_file, update_callback):
+        return
+
+      copied = 0
+      for buf in self._ReadChunks(stream):
+        destination_file.write(buf)
+        copied += len(buf)
+        if update_callback:
+          update_callback(copied, copied)
+
+  def _ReadChunks(self, stream):
+    """Reads a file object in chunks.
+
+    If the file object supports it, the data is read into the same buffer
+    every time, so each chunk needs to be consumed before reading the next.
+
+    Args:
+      stream (file): the file-like object to read.
+
+    Yields:
+      bytes|memoryview: the chunks of data.
+    """
+    if not hasattr(stream, 'readinto'):
+      # ie: mmap objects.
+      yield from iter(lambda: stream.read(self._COPY_BUFFER_SIZE), b'')
+      return
+
+    buffer_view = memoryview(bytearray(self._COPY_BUFFER_SIZE))
     while True:
-      buf = stream.read(buffer_length)
-      if not buf:
-        break
-      destination_file.write(buf)
-      copied += len(buf)
-      if update_callback:
-        update_callback(len(buf), copied)
+      read_size = stream.readinto(buffer_view)
+      if not read_size:
+        return
+      yield buffer_view[:read_size]
+
+  def _SendFile(self, stream, destination_file, update_callback=None):
+    """Copies a file object with sendfile(), without going through Python.
+
+    Args:
+      stream (file): the file-like object pointing to data to upload.
+      destination_file (file): the file object to copy the data to.
+      update_callback (func): an optional function called as upload progresses.
+
+    Returns:
+      bool: whether the data was copied, False if the stream isn't backed by a
+        file descriptor, or sendfile() isn't supported for these files.
+
+    Raises:
+      OSError: if sendfile() failed after some data was copied.
+    """
+    if not hasattr(os, 'sendfile'):
+      return False
+    try:
+      input_fd = stream.fileno()
+    except (AttributeError, OSError):
+      return False
+
+    copied = 0
+    try:
+      while True:
+        sent = os.sendfile(
+            destination_file.fileno(), input_fd, copied,
+            self._SENDFILE_MAX_SIZE)
+        if not sent:
+          break
+        copied += sent
+        if update_callback:
+          update_callback(copied, copied)
+    except OSError as e:
+      if copied:
+        raise
+      # ie: on macOS, where the destination needs to be a socket.
+      self._logger.debug('Unable to use sendfile(): %s', e)
+      return False
+    return True
 
   def _MakeRemotePath(self, destination):
     """Builds the remote path for an object.
@@ -160,9 +363,7 @@ class LocalCopier(BaseUploader):
         self._stamp_manager.BasePathElements(self._stamp) + [destination])
     remote_path = '/'.join(remote_path_elems)
 
-    base_dir = os.path.dirname(remote_path)
-    if not os.path.exists(base_dir):
-      os.makedirs(base_dir)
+    os.makedirs(os.path.dirname(remote_path), exist_ok=True)
 
     return remote_path
 
@@ -172,10 +373,13 @@ class LocalSplitterCopier(LocalCopier):
 
   This class is a specific implementation of LocalCopier, that will split
   DiskArtifacts (and only this class of Artifacts) into a specified number of
-  slices (10 by default).
+  slices (10 by default). Slices are copied one at a time by default, as
+  concurrent reads would compete for the head of a spinning source disk.
   """
 
-  def __init__(self, destination_dir, stamp_manager, stamp=None, slices=10):
+  def __init__(
+      self, destination_dir, stamp_manager, stamp=None, slices=10,
+      parallelism=1):
     """Initializes the LocalSplitterCopier class.
 
     Args:
@@ -185,8 +389,10 @@ class LocalSplitterCopier(LocalCopier):
       stamp (namedtuple): an optional ForensicsStamp containing
         the upload metadata.
       slices (int): the number of slices to split DiskArtifacts into
+      parallelism (int): the maximum number of slices to copy at once.
     """
     super().__init__(destination_dir, stamp_manager=stamp_manager, stamp=stamp)
+    self._parallelism = int(parallelism)
     self._slices = int(slices)
 
   def UploadArtifact(self, artifact, update_callback=None):
@@ -210,40 +416,10 @@ class LocalSplitterCopier(LocalCopier):
       self._UploadStream(
           artifact.OpenStream(), remote_path, update_callback=update_callback)
     else:
-      total_uploaded = 0
-      if self._slices < 1:
-        raise errors.BadConfigOption(
-            'The number of slices needs to be greater than 1')
-
-      # mmap requires that the an offset is a multiple of mmap.PAGESIZE
-      # so we can't just equally divide the total size in the specified number
-      # of slices.
-      number_of_pages = int(artifact.size / self._slices /  mmap.PAGESIZE)
-
-      slice_size = number_of_pages * mmap.PAGESIZE
-      # slice_size might not be equal to (total_size / slices)
-
-      base_remote_path = self._MakeRemotePath(artifact.remote_path)
-
-      stream = artifact.OpenStream()
-
-      for slice_num, seek_position in enumerate(
-          range(0, artifact.size, slice_size)):
-        remote_path = f'{base_remote_path}_{slice_num}'
-
-        current_slice_size = slice_size
-        if seek_position+slice_size > artifact.size:
-          current_slice_size = artifact.size - seek_position
-
-        mmap_slice = mmap.mmap(
-            stream.fileno(), length=current_slice_size, offset=seek_position,
-            access=mmap.ACCESS_READ)
-
-        self._UploadStream(
-            mmap_slice, remote_path, update_callback=update_callback)
-
-        total_uploaded += current_slice_size
-        update_callback(total_uploaded, artifact.size)
+      remote_path = _UploadSlices(
+          self._UploadStream, artifact,
+          self._MakeRemotePath(artifact.remote_path), self._slices,
+          self._parallelism, update_callback=update_callback)
 
     artifact.CloseStream()
     return remote_path
@@ -270,6 +446,7 @@ class GCSUploader(BaseUploader):
     self._client_id = client_id
     self._gs_keyfile = os.path.abspath(gs_keyfile)
     self._gs_url = gs_url
+    self._thread_local = threading.local()
 
   def _InitBoto(self):
     """Initializes the boto library with credentials from self._gs_keyfile."""
@@ -315,21 +492,40 @@ class GCSUploader(BaseUploader):
       str: the sanitized remote path.
     """
 
-    remote_path_elems = self._stamp_manager.BasePathElements(self._stamp)
-    remote_path = '/'.join(remote_path_elems)
-    base_path = None
-
     self._bucket_name, base_path = self._SplitGCSUrl()
 
+    remote_path_elems = [self._bucket_name]
     if base_path:
-      remote_path = '/'.join([base_path, remote_path])
-
+      remote_path_elems.append(base_path)
+    remote_path_elems.extend(
+        self._stamp_manager.BasePathElements(self._stamp))
     if destination:
-      remote_path = '/'.join([remote_path, destination])
+      remote_path_elems.append(destination)
 
-    remote_path = '/'.join([self._bucket_name, remote_path])
+    return '/'.join(remote_path_elems)
 
-    return remote_path
+  def _GetStorageUri(self, remote_path):
+    """Builds a boto StorageUri object using the current thread's connection.
+
+    boto shares a single connection between all StorageUri objects of a given
+    scheme, but slices can be uploaded from several threads at once, so each
+    thread gets its own connection instead.
+
+    Args:
+      remote_path (str): the remote path to the object.
+
+    Returns:
+      boto.storage_uri.BucketStorageUri: the StorageUri object.
+    """
+    dst_uri = boto.storage_uri(remote_path, u'gs')
+    connection = getattr(self._thread_local, 'connection', None)
+    if connection is None:
+      # An empty pool makes connect() open a new connection.
+      dst_uri.provider_pool = {}
+      self._thread_local.connection = dst_uri.connect()
+    else:
+      dst_uri.connection = connection
+    return dst_uri
 
   def _UploadStream(self, stream, remote_path, update_callback=None):
     """Uploads a file object to Google Cloud Storage.
@@ -346,7 +542,7 @@ class GCSUploader(BaseUploader):
       self._InitBoto()
 
     try:
-      dst_uri = boto.storage_uri(remote_path, u'gs')
+      dst_uri = self._GetStorageUri(remote_path)
       dst_uri.new_key().set_contents_from_stream(stream, cb=update_callback)
     except boto.exception.GSDataError as e:
       # This is usually raised when the connection is broken, and deserves to
@@ -359,12 +555,12 @@ class GCSSplitterUploader(GCSUploader):
 
   This class is a specific implementation of GCSUploader, that will split
   DiskArtifacts (and only this class of Artifacts) into a specified number of
-  slices (10 by default).
+  slices (10 by default), uploaded in parallel.
   """
 
   def __init__(
       self, gs_url, gs_keyfile, client_id, stamp_manager, stamp=None,
-      slices=10):
+      slices=10, parallelism=8):
     """Initializes a GCSSplitterUploader object.
 
     Args:
@@ -376,8 +572,10 @@ class GCSSplitterUploader(GCSUploader):
       stamp (namedtuple): an optional ForensicsStamp containing
         the upload metadata.
       slices (int): the number of slices to split DiskArtifacts into.
+      parallelism (int): the maximum number of slices to upload at once.
     """
     super().__init__(gs_url, gs_keyfile, client_id, stamp_manager, stamp=stamp)
+    self._parallelism = int(parallelism)
     self._slices = int(slices)
 
   def UploadArtifact(self, artifact, update_callback=None):
@@ -405,40 +603,10 @@ class GCSSplitterUploader(GCSUploader):
           artifact.OpenStream(), remote_path, update_callback=update_callback)
 
     else:
-      total_uploaded = 0
-      if self._slices < 1:
-        raise errors.BadConfigOption(
-            'The number of slices needs to be greater than 1')
-
-      # mmap requires that the an offset is a multiple of mmap.PAGESIZE
-      # so we can't just equally divide the total size in the specified number
-      # of slices.
-      number_of_pages = int(artifact.size / self._slices /  mmap.PAGESIZE)
-
-      slice_size = number_of_pages * mmap.PAGESIZE
-      # slice_size might not be equal to (total_size / slices)
-
-      base_remote_path = self._MakeRemotePath(artifact.remote_path)
-
-      stream = artifact.OpenStream()
-
-      for slice_num, seek_position in enumerate(
-          range(0, artifact.size, slice_size)):
-        remote_path = f'{base_remote_path}_{slice_num}'
-
-        current_slice_size = slice_size
-        if seek_position+slice_size > artifact.size:
-          current_slice_size = artifact.size - seek_position
-
-        mmap_slice = mmap.mmap(
-            stream.fileno(), length=current_slice_size, offset=seek_position,
-            access=mmap.ACCESS_READ)
-
-        self._UploadStream(
-            mmap_slice, remote_path, update_callback=update_callback)
-
-        total_uploaded += current_slice_size
-        update_callback(total_uploaded, artifact.size)
+      remote_path = _UploadSlices(
+          self._UploadStream, artifact,
+          self._MakeRemotePath(artifact.remote_path), self._slices,
+          self._parallelism, update_callback=update_callback)
 
     artifact.CloseStream()
     return remote_path
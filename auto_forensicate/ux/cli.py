@@ -50,24 +50,26 @@ def AskDiskList(disk_list):
     print('\nPlease select which disks to copy:')
     for num, disk in enumerate(disk_list, start=0):
       print('{0:d}\t{1:s}'.format(num, disk.GetDescription()))
-      user_choices = input(
-          'Disk numbers (Default is [{0:s}], comma separated): '.format(
-              ','.join([str(i) for i in disk_indices_to_copy])))
+    user_choices = input(
+        'Disk numbers (Default is [{0:s}], comma separated): '.format(
+            ','.join([str(i) for i in disk_indices_to_copy])))
     if user_choices == '':
       valid_choice = True
     else:
-      choices = user_choices.replace(' ', ',').split(',')
       try:
         # Check that all provided indices are valid integers.
-        choices = list(map(int, choices))
+        choices = [
+            int(choice) for choice in user_choices.replace(' ', ',').split(',')
+            if choice]
       except ValueError:
         continue
       # Check that all provided indices are between expected values
-      if all([0 <= int(i) < len(disk_list) for i in choices]):
+      if choices and all(0 <= choice < len(disk_list) for choice in choices):
         valid_choice = True
-        # Removing double values
-        disk_indices_to_copy = list(set(choices))
+        disk_indices_to_copy = choices
 
+  # Using a set also removes double values
+  disk_indices_to_copy = set(disk_indices_to_copy)
   return [
       disk for index, disk in enumerate(disk_list, start=0)
       if index in disk_indices_to_copy
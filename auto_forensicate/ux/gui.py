@@ -44,18 +44,14 @@ def AskDiskList(disk_list):
   Returns:
     list(DiskArtifact): a list of devices.
   """
-  disk_description_map = dict(
-      zip(
-          [disk.GetDescription() for disk in disk_list],
-          [disk for disk in disk_list],
-      )
-  )
-
+  disk_description_map = {}
   data = []
   for disk in disk_list:
+    description = disk.GetDescription()
+    disk_description_map[description] = disk
     # Default is to un-check block devices that are not internal disks.
     data.append(str(disk.ProbablyADisk()))
-    data.append(disk.GetDescription())
+    data.append(description)
 
   choices = []
   while not choices:
@@ -29,11 +29,11 @@ def GetYesNo(text):
 
   zenity_binary = Which('zenity')
 
-  process = subprocess.Popen(
-      [zenity_binary, '--question', '--text="{0:s}"'.format(text)],
-      stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+  process = subprocess.run(
+      [zenity_binary, '--question', '--text={0:s}'.format(text)],
+      stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, check=False)
 
-  return process.wait() == 0
+  return process.returncode == 0
 
 
 def GetText(text):
@@ -42,19 +42,19 @@ def GetText(text):
   Args:
     text(str): The message to display.
   Returns:
-    str: the user input.
+    bytes: the user input.
   """
 
   zenity_binary = Which('zenity')
 
-  process = subprocess.Popen(
-      [zenity_binary, '--entry', '--text="{0:s}"'.format(text)],
-      stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+  process = subprocess.run(
+      [zenity_binary, '--entry', '--text={0:s}'.format(text)],
+      stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, check=False)
 
-  if process.wait() == 0:
-    return process.stdout.read()[:-1]
+  if process.returncode == 0:
+    return process.stdout[:-1]
 
-  return ''
+  return b''
 
 def CheckList(column_names, data, title=None):
   """Present a list of items to select.
@@ -79,11 +79,11 @@ def CheckList(column_names, data, title=None):
 
   command = command + data
 
-  process = subprocess.Popen(
-      command, stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+  process = subprocess.run(
+      command, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, check=False)
 
-  if process.wait() == 0:
-    process_out = process.stdout.read().decode()
+  if process.returncode == 0:
+    process_out = process.stdout.decode()
     return process_out.strip().split('|')
 
   return []
@@ -23,6 +23,16 @@ import re
 from urllib.parse import urlparse
 
 
+_IDENTIFIER_REGEX = re.compile(
+    r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$')
+_START_TIME_REGEX = re.compile(r'^[0-9]{8}-[0-9]{6}$')
+_SYSINFO_REGEX = re.compile(
+    r'System Information\n\W+Manufacturer: QEMU', re.MULTILINE)
+_UDEVADM_REGEX = re.compile(
+    r'^(DEVTYPE|ID_MODEL|ID_SERIAL)=(.*)$', re.MULTILINE)
+_MULTIPLE_SLASHES_REGEX = re.compile(r'/+')
+
+
 def NormalizeGCSURL(url):
   """Normalize a GCS URL.
 
@@ -33,7 +43,7 @@ def NormalizeGCSURL(url):
     str: the normalized URL
   """
   parsed_url = urlparse(url)
-  path_with_no_double_slash = parsed_url.path.replace('//', '/')
+  path_with_no_double_slash = _MULTIPLE_SLASHES_REGEX.sub('/', parsed_url.path)
   parsed_url = parsed_url._replace(path=path_with_no_double_slash)
   return parsed_url.geturl()
 
@@ -51,12 +61,10 @@ def CheckStamp(stamp_path):
   with open(stamp_path, 'r') as stamp_file:
     stamp_dict = json.load(stamp_file)
 
-  identifier_regex = re.compile(
-      r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$')
-  assert identifier_regex.match(stamp_dict.get('identifier'))
-
-  start_time_regex = re.compile(r'^[0-9]{8}-[0-9]{6}$')
-  assert start_time_regex.match(stamp_dict.get('start_time'))
+  if not _IDENTIFIER_REGEX.match(stamp_dict.get('identifier') or ''):
+    raise ValueError('Bad identifier in {0:s}'.format(stamp_path))
+  if not _START_TIME_REGEX.match(stamp_dict.get('start_time') or ''):
+    raise ValueError('Bad start_time in {0:s}'.format(stamp_path))
 
 
 def CheckSystemInfo(system_info_path):
@@ -73,9 +81,11 @@ def CheckSystemInfo(system_info_path):
   with open(system_info_path, 'r') as system_info_file:
     system_info = system_info_file.read()
 
-  sysinfo_regex = re.compile(
-      r'System Information\n\W+Manufacturer: QEMU', re.MULTILINE)
-  assert sysinfo_regex.search(system_info)
+  # Only run the regex from the first occurrence of its literal prefix.
+  start = system_info.find('System Information')
+  if start < 0 or not _SYSINFO_REGEX.search(system_info, start):
+    raise ValueError(
+        'No QEMU system information in {0:s}'.format(system_info_path))
 
 
 def CheckLsblk(lsblk_path):
@@ -91,16 +101,18 @@ def CheckLsblk(lsblk_path):
   with open(lsblk_path) as lsblk_file:
     lsblk_dict = json.load(lsblk_file)
 
-  assert len(lsblk_dict['blockdevices']) == 6
+  if len(lsblk_dict['blockdevices']) != 6:
+    raise ValueError('Unexpected block devices in {0:s}'.format(lsblk_path))
   sdb_disk = [
       dev for dev in lsblk_dict['blockdevices'] if dev['name'] == 'sdb'][0]
 
-  assert int(sdb_disk['size']) == 44040192
+  if int(sdb_disk['size']) != 44040192:
+    raise ValueError('Unexpected sdb size in {0:s}'.format(lsblk_path))
   children = sorted(
       [(child['name'], child['maj:min'], int(child['size']))
        for child in sdb_disk['children']])
-  assert children == [
-      ('sdb1', '8:17', 12582912), ('sdb2', '8:18', 30408704)]
+  if children != [('sdb1', '8:17', 12582912), ('sdb2', '8:18', 30408704)]:
+    raise ValueError('Unexpected sdb partitions in {0:s}'.format(lsblk_path))
 
 
 def CheckDiskHash(hash_path):
@@ -120,8 +132,10 @@ Total (md5): 1e639d0a0b2c718eae71a058582a555e
 Total (sha1): 11840d13e5e9462f6acfa7bb9f700268202e29bf
 """
   with open(hash_path, 'r') as hash_file:
-    hash_file_content = hash_file.read()
-    assert hash_file_content == expected
+    # Don't read more than needed to tell whether the file is as expected.
+    hash_file_content = hash_file.read(len(expected) + 1)
+    if hash_file_content != expected:
+      raise ValueError('Unexpected hashes in {0:s}'.format(hash_path))
 
 
 def CheckUdevadm(udevadm_path):
@@ -139,14 +153,13 @@ def CheckUdevadm(udevadm_path):
       ['ID_SERIAL', 'QEMU_HARDDISK_QM00002']]
 
   with open(udevadm_path, 'r') as udevadm_file:
-    udevadm_content = udevadm_file.read().splitlines()
-    udevadm_pairs = [pair.split('=') for pair in udevadm_content]
-
-    interesting_keys = ['ID_SERIAL', 'ID_MODEL', 'DEVTYPE']
     data_to_check = [
-        pair for pair in udevadm_pairs if pair[0] in interesting_keys]
+        list(match.groups())
+        for match in _UDEVADM_REGEX.finditer(udevadm_file.read())]
 
-    assert data_to_check == expected
+    if data_to_check != expected:
+      raise ValueError(
+          'Unexpected udevadm properties in {0:s}'.format(udevadm_path))
 
 
 def ParseArguments():
@@ -12,16 +12,67 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-"""Run all tests inside the tests folder."""
-import unittest
+"""Run all tests inside the tests folder.
+
+Each test module is run in its own worker process, so that the suite is
+spread across all available cores.
+"""
+import glob
+import io
+import multiprocessing
 import os
 import sys
+import unittest
+
+
+START_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tests')
+PATTERN = '*_tests.py'
+
+
+def RunTestModule(module_filename):
+  """Runs all the tests in one test module.
+
+  Args:
+    module_filename(str): the name of the module file in START_DIR.
+  Returns:
+    tuple(str, int, bool): the runner output, the number of tests run, and
+      whether they all succeeded.
+  """
+  loader = unittest.TestLoader()
+  suite = loader.discover(START_DIR, pattern=module_filename)
+  output = io.StringIO()
+  result = unittest.TextTestRunner(stream=output).run(suite)
+  return output.getvalue(), result.testsRun, result.wasSuccessful()
+
+
+def Main():
+  """Runs every test module in parallel and reports the overall result.
+
+  Returns:
+    bool: True if all tests succeeded.
+  """
+  module_filenames = sorted(
+      os.path.basename(path)
+      for path in glob.glob(os.path.join(START_DIR, PATTERN)))
+
+  pool = multiprocessing.Pool()
+  try:
+    results = pool.map(RunTestModule, module_filenames)
+  finally:
+    pool.close()
+    pool.join()
+
+  tests_run = 0
+  success = True
+  for output, module_tests_run, module_success in results:
+    sys.stderr.write(output)
+    tests_run += module_tests_run
+    success = success and module_success
 
+  sys.stderr.write('\nRan {0:d} tests in {1:d} modules: {2:s}\n'.format(
+      tests_run, len(module_filenames), 'OK' if success else 'FAILED'))
+  return success
 
-loader = unittest.TestLoader()
-start_dir = os.path.join(os.path.dirname(__file__), 'tests')
-suite = loader.discover(start_dir, pattern='*_tests.py')
 
-runner = unittest.TextTestRunner()
-result = runner.run(suite)
-sys.exit(not result.wasSuccessful())
+if __name__ == '__main__':
+  sys.exit(not Main())
@@ -14,7 +14,6 @@
 # limitations under the License.
 """Installation and deployment script."""
 
-import pkg_resources
 from setuptools import find_packages
 from setuptools import setup
 
@@ -29,9 +28,11 @@ def ParseRequirements(filename):
   """
   install_requires = []
   with open(filename) as requirements:
-    install_requires = [
-        str(requirement) for requirement in
-        pkg_resources.parse_requirements(requirements)]
+    for line in requirements:
+      # Drop comments, including trailing ones, and blank lines.
+      requirement = line.split('#', 1)[0].strip()
+      if requirement:
+        install_requires.append(requirement)
 
   return install_requires
 
@@ -17,12 +17,12 @@
 from __future__ import unicode_literals
 
 import argparse
+from contextlib import redirect_stderr
+from io import StringIO
 import logging
 import os
-import sys
 import tempfile
 import unittest
-from six import StringIO
 import mock
 
 from auto_forensicate import auto_acquire
@@ -30,7 +30,7 @@ from auto_forensicate import errors
 from auto_forensicate import uploader
 from auto_forensicate.recipes import base
 
-DEFAULT_ARTIFACT_CONTENT = os.urandom(1000)
+DEFAULT_ARTIFACT_CONTENT = (bytes(bytearray(range(256))) * 4)[:1000]
 
 # pylint: disable=missing-docstring
 # pylint: disable=protected-access
@@ -57,33 +57,41 @@ class FailingRecipe(base.BaseRecipe):
 class FileCopyUploader(object):
   """Test implementation of an Uploader object that copies content to a file."""
 
+  _COPY_BUFFER_SIZE = 1024 * 1024
+
   def __init__(self, destination_file):
     self._origin_dir = os.getcwd()
     self.destination_file = destination_file
 
   def UploadArtifact(self, artifact, update_callback=None):
-    data = artifact._GetStream().read()
-    self.destination_file.write(data)
-    if update_callback:
-      update_callback(len(data), len(data))
+    stream = artifact._GetStream()
+    copied = 0
+    while True:
+      data = stream.read(self._COPY_BUFFER_SIZE)
+      if not data:
+        break
+      self.destination_file.write(data)
+      copied += len(data)
+      if update_callback:
+        update_callback(copied, copied)
 
 
 class FakeGCSUploader(object):
   """Test implementation of a GCS Uploader for testing progress reporting"""
 
   def UploadArtifact(self, artifact, update_callback=None):
-    current_bytes = 0
     total_bytes = 0
     boto_callback_interval = 1024
 
-    update_callback(current_bytes, total_bytes)
-    while True:
-      data = artifact._GetStream().read(boto_callback_interval)
-      if data:
-        current_bytes += len(data)
-        update_callback(current_bytes, total_bytes)
-      else:
-        break
+    # Only the callbacks matter here, so read the artifact in one go and
+    # report progress as boto would for each interval.
+    artifact_size = len(artifact._GetStream().read())
+    update_callback(0, total_bytes)
+    for current_bytes in range(
+        boto_callback_interval, artifact_size, boto_callback_interval):
+      update_callback(current_bytes, total_bytes)
+    if artifact_size:
+      update_callback(artifact_size, total_bytes)
 
 
 class FakeGoogleLogger(object):
@@ -110,9 +118,11 @@ class HumanReadableBytesTest(unittest.TestCase):
         '1.2 PB', '12.3 PB', '123.0 PB',
         '1230.0 PB', '12300.0 PB', '123000.0 PB',
     ]
+    byte_val = 1.23
     for index, value in enumerate(expected):
-      self.assertEqual(
-          auto_acquire.HumanReadableBytes(1.23 * (10 ** index)), value)
+      with self.subTest(index=index):
+        self.assertEqual(auto_acquire.HumanReadableBytes(byte_val), value)
+      byte_val *= 10
 
   def testBin(self):
     """Tests binary prefix based conversions"""
@@ -198,11 +208,8 @@ class AutoForensicateTest(unittest.TestCase):
     }
     af = auto_acquire.AutoForensicate(recipes=recipes)
     test_args = ['--acquire', 'test1', '--logging', 'stackdriver']
-    with self.assertRaises(SystemExit):
-      prev_stderr = sys.stderr
-      sys.stderr = StringIO()
+    with redirect_stderr(StringIO()), self.assertRaises(SystemExit):
       af.ParseArguments(test_args)
-    sys.stderr = prev_stderr
 
   def testParseArgsRequiredURL(self):
     recipes = {
@@ -211,11 +218,8 @@ class AutoForensicateTest(unittest.TestCase):
     }
     af = auto_acquire.AutoForensicate(recipes=recipes)
     test_args = ['--acquire', 'test1', '--gs_keyfile=null']
-    prev_stderr = sys.stderr
-    sys.stderr = StringIO()
-    with self.assertRaises(SystemExit):
+    with redirect_stderr(StringIO()), self.assertRaises(SystemExit):
       af.ParseArguments(test_args)
-    sys.stderr = prev_stderr
 
   def testParseAcquireOneRecipe(self):
     recipes = {
@@ -238,11 +242,8 @@ class AutoForensicateTest(unittest.TestCase):
     test_args = [
         '--acquire', 'test4', '--acquire', 'all',
         '--gs_keyfile=file', 'gs://bucket']
-    prev_stderr = sys.stderr
-    sys.stderr = StringIO()
-    with self.assertRaises(SystemExit):
+    with redirect_stderr(StringIO()), self.assertRaises(SystemExit):
       af.ParseArguments(test_args)
-    sys.stderr = prev_stderr
 
   def testParseAcquireAll(self):
     recipes = {
@@ -273,6 +274,44 @@ class AutoForensicateTest(unittest.TestCase):
     with self.assertRaises(errors.BadConfigOption):
       options = af.ParseArguments(test_args)
 
+  def testSliceParallelismOption(self):
+    af = auto_acquire.AutoForensicate(recipes={'test': None})
+
+    options = af.ParseArguments(
+        ['--slice_disks', '8', '--acquire', 'all', '/destination'])
+    uploader_object = af._MakeUploader(options)
+    self.assertIsInstance(uploader_object, uploader.LocalSplitterCopier)
+    self.assertEqual(uploader_object._parallelism, 1)
+
+    options = af.ParseArguments(
+        ['--slice_disks', '8', '--slice_parallelism', '3', '--acquire', 'all',
+         '/destination'])
+    uploader_object = af._MakeUploader(options)
+    self.assertEqual(uploader_object._parallelism, 3)
+
+    af._ParseGCSJSON = self.FakeParseGCSJSON
+    options = af.ParseArguments(
+        ['--slice_disks', '8', '--slice_parallelism', '3', '--acquire', 'all',
+         '--gs_keyfile', 'keyfile', 'gs://destination'])
+    uploader_object = af._MakeUploader(options)
+    self.assertIsInstance(uploader_object, uploader.GCSSplitterUploader)
+    self.assertEqual(uploader_object._parallelism, 3)
+
+  def testSliceParallelismOptionBad(self):
+    af = auto_acquire.AutoForensicate(recipes={'test': None})
+
+    # Parallelism without slices
+    test_args = ['--slice_parallelism', '2', '--acquire', 'all', 'gs://bucket']
+    with self.assertRaises(errors.BadConfigOption):
+      af.ParseArguments(test_args)
+
+    # Invalid parallelism
+    test_args = [
+        '--slice_disks', '8', '--slice_parallelism', '0', '--acquire', 'all',
+        'gs://bucket']
+    with self.assertRaises(errors.BadConfigOption):
+      af.ParseArguments(test_args)
+
   def testMakeUploader(self):
     af = auto_acquire.AutoForensicate(recipes={'test': None})
 
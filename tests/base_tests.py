@@ -21,6 +21,7 @@ import tempfile
 import unittest
 import mock
 
+from auto_forensicate import errors
 from auto_forensicate.recipes import base
 
 
@@ -96,6 +97,34 @@ class ProcessOutputArtifactTest(unittest.TestCase):
     self.assertEqual(artifact_content, self._TEST_OUTPUT)
 
 
+class FileBackedProcessOutputArtifactTest(unittest.TestCase):
+  """Tests for the FileBackedProcessOutputArtifact class."""
+
+  _TEST_OUTPUT = b'this is some command output'
+
+  def testGetStream(self):
+    """Tests GetStream"""
+    cmd = ['echo', '-n', self._TEST_OUTPUT]
+    artifact = base.FileBackedProcessOutputArtifact(cmd, 'output.txt')
+    self.assertEqual(artifact.size, 0)
+
+    artifact_content = artifact.OpenStream().read()
+    self.assertEqual(artifact.size, 27)
+    self.assertEqual(artifact_content, self._TEST_OUTPUT)
+    artifact.CloseStream()
+
+  def testGetStreamFailure(self):
+    """Tests GetStream with a failing command"""
+    artifact = base.FileBackedProcessOutputArtifact(
+        ['false'], 'output.txt', ignore_failure=True)
+    artifact_content = artifact.OpenStream().read()
+    self.assertTrue(artifact_content.startswith(b'Command \'[\'false\']\''))
+
+    artifact = base.FileBackedProcessOutputArtifact(['false'], 'output.txt')
+    with self.assertRaises(errors.RecipeException):
+      artifact.OpenStream()
+
+
 class BaseRecipeTests(unittest.TestCase):
   """Tests for the BaseRecipe class."""
 
@@ -17,7 +17,6 @@
 from __future__ import unicode_literals
 
 import os
-import subprocess
 import tempfile
 import unittest
 from auto_forensicate.recipes import directory
@@ -29,39 +28,47 @@ from auto_forensicate.recipes import directory
 class DirectoryArtifactTests(unittest.TestCase):
   """Tests for the DirectoryArtifact class."""
 
-  def _EmptyFolderSize(self):
+  @classmethod
+  def setUpClass(cls):
+    # The tests never write to the directory, so they can share it.
+    cls._temp_dir = tempfile.TemporaryDirectory()
+
+  @classmethod
+  def tearDownClass(cls):
+    cls._temp_dir.cleanup()
+
+  def _EmptyFolderSize(self, path):
     """Returns the size of an empty folder.
 
-    This should match the current filesystem blocksize.
+    This should match the blocksize of the filesystem holding path.
     """
-    size = int(subprocess.check_output(['stat', '-fc', '%s', '.']).strip())
-    return size
+    return os.statvfs(path).f_bsize
 
   def testInstantiate(self):
-    with tempfile.TemporaryDirectory() as path:
-      expected_name = path.replace(os.path.sep, '_')
-      d = directory.DirectoryArtifact(path, method='tar', compress=False)
-      self.assertEqual(d.path, path)
-      self.assertEqual(d.name, expected_name)
-      self.assertEqual(
-          d.remote_path, 'Directories/{0:s}.tar'.format(expected_name))
-      self.assertEqual(d.size, self._EmptyFolderSize())
+    path = self._temp_dir.name
+    expected_name = path.replace(os.path.sep, '_')
+    d = directory.DirectoryArtifact(path, method='tar', compress=False)
+    self.assertEqual(d.path, path)
+    self.assertEqual(d.name, expected_name)
+    self.assertEqual(
+        d.remote_path, 'Directories/{0:s}.tar'.format(expected_name))
+    self.assertEqual(d.size, self._EmptyFolderSize(path))
 
-      d = directory.DirectoryArtifact(path, method='tar', compress=True)
-      self.assertEqual(
-          d.remote_path, 'Directories/{0:s}.tar.gz'.format(expected_name))
+    d = directory.DirectoryArtifact(path, method='tar', compress=True)
+    self.assertEqual(
+        d.remote_path, 'Directories/{0:s}.tar.gz'.format(expected_name))
 
   def testGenerateTarCopyCommand(self):
-    with tempfile.TemporaryDirectory() as path:
-      d = directory.DirectoryArtifact(path, method='tar', compress=False)
-      command = d._TAR_COMMAND
-      command.append(path)
-      self.assertEqual(d._GenerateCopyCommand(), command)
+    path = self._temp_dir.name
+    d = directory.DirectoryArtifact(path, method='tar', compress=False)
+    command = d._TAR_COMMAND
+    command.append(path)
+    self.assertEqual(d._GenerateCopyCommand(), command)
 
   def testGenerateTarGzCopyCommand(self):
-    with tempfile.TemporaryDirectory() as path:
-      d = directory.DirectoryArtifact(path, method='tar', compress=True)
-      command = d._TAR_COMMAND
-      command.append('-z')
-      command.append(path)
-      self.assertEqual(d._GenerateCopyCommand(), command)
+    path = self._temp_dir.name
+    d = directory.DirectoryArtifact(path, method='tar', compress=True)
+    command = d._TAR_COMMAND
+    command.append('-z')
+    command.append(path)
+    self.assertEqual(d._GenerateCopyCommand(), command)
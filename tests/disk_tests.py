@@ -16,7 +16,11 @@
 
 from __future__ import unicode_literals
 
+import hashlib
+import io
 import json
+import os
+import tempfile
 import unittest
 import mock
 from auto_forensicate import errors
@@ -42,20 +46,117 @@ class DiskArtifactTests(unittest.TestCase):
     self.assertEqual(d.remote_path, 'Disks/{0:s}.image'.format(name))
     self.assertEqual(d.hashlog_filename, '{0:s}.hash'.format(name))
 
-  def testGenerateDDCommand(self):
-    name = 'sdx'
-    path = '/dev/{0:s}'.format(name)
-    dd_command = [
-        '/some/place/random/bin/dcfldd', 'if={0:s}'.format(path),
-        'hashlog={0:s}.hash'.format(name)]
-    dd_static_options = [
-        'hash=md5,sha1', 'bs=2M', 'conv=noerror', 'hashwindow=128M']
-    dd_command.extend(dd_static_options)
-
-    with mock.patch('auto_forensicate.hostinfo.Which') as patched_which:
-      patched_which.return_value = '/some/place/random/bin/dcfldd'
-      d = disk.DiskArtifact(path, 100)
-      self.assertEqual(d._GenerateDDCommand(), dd_command)
+  def testReadAndHash(self):
+    data = bytes(range(0, 256)) * 4096
+    with tempfile.TemporaryDirectory() as temp_dir:
+      disk_path = os.path.join(temp_dir, 'sdx')
+      with open(disk_path, 'wb') as disk_file:
+        disk_file.write(data)
+
+      d = disk.DiskArtifact('/dev/sdx', len(data))
+      d._path = disk_path
+      d._HASH_WINDOW_SIZE = 400000
+      d.hashlog_filename = os.path.join(temp_dir, 'sdx.hash')
+
+      self.assertEqual(d.OpenStream().read(), data)
+      close_result = d.CloseStream()
+
+      expected_hashlog = ''
+      for start in range(0, len(data), d._HASH_WINDOW_SIZE):
+        end = min(start + d._HASH_WINDOW_SIZE, len(data))
+        expected_hashlog += '{0:d} - {1:d}: {2:s}\n'.format(
+            start, end, hashlib.md5(data[start:end]).hexdigest())
+        expected_hashlog += '{0:d} - {1:d}: {2:s}\n'.format(
+            start, end, hashlib.sha1(data[start:end]).hexdigest())
+      expected_total_hashes = '\nTotal (md5): {0:s}\n'.format(
+          hashlib.md5(data).hexdigest())
+      expected_total_hashes += '\nTotal (sha1): {0:s}\n'.format(
+          hashlib.sha1(data).hexdigest())
+      expected_hashlog += expected_total_hashes
+      self.assertEqual(close_result, expected_total_hashes)
+      with open(d.hashlog_filename, 'r') as hashlog_file:
+        self.assertEqual(hashlog_file.read(), expected_hashlog)
+
+  @unittest.skipUnless(hasattr(os, 'posix_fadvise'), 'Needs posix_fadvise()')
+  def testReadAdvisesKernel(self):
+    with tempfile.NamedTemporaryFile() as disk_file:
+      disk_file.write(b'A' * 4096)
+      disk_file.flush()
+      with mock.patch('os.posix_fadvise') as patched_fadvise:
+        reader = disk.HashingReader(disk_file.name, 4096, None, 1024)
+        reader.read()
+        fd = reader._file.fileno()
+        reader.close()
+      self.assertEqual(
+          patched_fadvise.call_args_list[0],
+          mock.call(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL))
+      self.assertEqual(
+          patched_fadvise.call_args_list[-1],
+          mock.call(fd, 3072, 1024, os.POSIX_FADV_DONTNEED))
+
+  def testReadErrorOnlyZeroesBadSectors(self):
+    data = bytes(range(0, 256)) * 16
+    bad_sector = (1024, 1536)
+
+    class FaultyFile(io.FileIO):
+
+      def readinto(self, b):
+        start = self.tell()
+        if start < bad_sector[1] and start + len(b) > bad_sector[0]:
+          raise OSError('Input/output error')
+        return super(FaultyFile, self).readinto(b)
+
+    with tempfile.NamedTemporaryFile() as disk_file:
+      disk_file.write(data)
+      disk_file.flush()
+      reader = disk.HashingReader(disk_file.name, len(data), None, 1024)
+      reader._file.close()
+      reader._file = FaultyFile(disk_file.name)
+      read_data = reader.read()
+      reader.close()
+
+    expected_data = (
+        data[:bad_sector[0]] + bytes(bad_sector[1] - bad_sector[0]) +
+        data[bad_sector[1]:])
+    self.assertEqual(read_data, expected_data)
+
+  def testCloseStreamEarly(self):
+    with tempfile.NamedTemporaryFile() as disk_file:
+      disk_file.write(b'A' * 4096)
+      disk_file.flush()
+      d = disk.DiskArtifact('/dev/sdx', 4096)
+      d._path = disk_file.name
+      d._READ_BUFFER_SIZE = 1024
+
+      d.OpenStream().read(1024)
+      with self.assertRaises(errors.RecipeException):
+        d.CloseStream()
+
+
+class ReadAheadReaderTests(unittest.TestCase):
+  """Tests for the ReadAheadReader class."""
+
+  def testRead(self):
+    data = bytes(range(0, 256)) * 100
+    reader = disk.ReadAheadReader(io.BytesIO(data), 1000, 2)
+    self.assertEqual(reader.read(10), data[:10])
+    self.assertEqual(reader.read(), data[10:])
+    self.assertEqual(reader.read(10), b'')
+    self.assertEqual(reader.tell(), len(data))
+    reader.close()
+
+  def testReadError(self):
+    failing_stream = mock.Mock()
+    failing_stream.read.side_effect = IOError('Input/output error')
+    reader = disk.ReadAheadReader(failing_stream, 1000, 2)
+    with self.assertRaises(IOError):
+      reader.read(10)
+    # The reading thread is gone, later reads must not wait for it.
+    with self.assertRaises(IOError):
+      reader.read(10)
+    reader.close()
+    failing_stream.close.assert_called_once()
+
 
 class LinuxDiskArtifactTests(unittest.TestCase):
   """Tests for the LinuxDiskArtifact class."""
@@ -126,42 +227,43 @@ class LinuxDiskArtifactTests(unittest.TestCase):
 class DiskRecipeTests(unittest.TestCase):
   """Tests for the DiskRecipe (on linux) class."""
 
-  def setUp(self):
-    self._lsblk_dict = {
-        'blockdevices': [
-            {'name': 'loop0', 'maj:min': '7:0', 'rm': '0', 'size': '1073741824',
-             'ro': '1', 'type': 'loop', 'mountpoint': '/dev/loop0', 'uuid': None
-            },
-            {'name': 'sdx', 'maj:min': '8:0', 'rm': '0', 'size': '502110190592',
-             'ro': '0', 'type': 'disk', 'mountpoint': None,
-             'children': [
-                 {'name': 'sdx1', 'maj:min': '8:1', 'rm': '0',
-                  'size': '48725121', 'ro': '0', 'type': 'part',
-                  'mountpoint': '/boot', 'uuid': 'fake_uuid_1'},
-                 {'name': 'sdx2', 'maj:min': '8:2', 'rm': '0', 'size': '231201',
-                  'ro': '0', 'type': 'part', 'mountpoint': None,
-                  'uuid': 'fake_uuid_2'},
-             ]
-            },
-            {'name': 'usb0', 'maj:min': '8:16', 'rm': '1', 'size': '3000041824',
-             'ro': '0', 'type': 'disk', 'mountpoint': None, 'uuid': None
-            },
-            {'name': 'sdy', 'maj:min': '8:0', 'rm': '0', 'size': '512110190592',
-             'ro': '0', 'type': 'disk', 'mountpoint': None, 'uuid': None,
-             'children': [
-                 {'name': 'sdy1', 'maj:min': '8:1', 'rm': '0',
-                  'size': '48725121', 'ro': '0', 'type': 'part',
-                  'mountpoint': '/boot', 'uuid': None},
-             ]
-            }
-        ]
-    }
+  # Only read by the tests, so it is safe to share between them.
+  _LSBLK_DICT = {
+      'blockdevices': [
+          {'name': 'loop0', 'maj:min': '7:0', 'rm': '0', 'size': '1073741824',
+           'ro': '1', 'type': 'loop', 'mountpoint': '/dev/loop0', 'uuid': None
+          },
+          {'name': 'sdx', 'maj:min': '8:0', 'rm': '0', 'size': '502110190592',
+           'ro': '0', 'type': 'disk', 'mountpoint': None,
+           'children': [
+               {'name': 'sdx1', 'maj:min': '8:1', 'rm': '0',
+                'size': '48725121', 'ro': '0', 'type': 'part',
+                'mountpoint': '/boot', 'uuid': 'fake_uuid_1'},
+               {'name': 'sdx2', 'maj:min': '8:2', 'rm': '0', 'size': '231201',
+                'ro': '0', 'type': 'part', 'mountpoint': None,
+                'uuid': 'fake_uuid_2'},
+           ]
+          },
+          {'name': 'usb0', 'maj:min': '8:16', 'rm': '1', 'size': '3000041824',
+           'ro': '0', 'type': 'disk', 'mountpoint': None, 'uuid': None
+          },
+          {'name': 'sdy', 'maj:min': '8:0', 'rm': '0', 'size': '512110190592',
+           'ro': '0', 'type': 'disk', 'mountpoint': None, 'uuid': None,
+           'children': [
+               {'name': 'sdy1', 'maj:min': '8:1', 'rm': '0',
+                'size': '48725121', 'ro': '0', 'type': 'part',
+                'mountpoint': '/boot', 'uuid': None},
+           ]
+          }
+      ]
+  }
+  _LSBLK_JSON = json.dumps(_LSBLK_DICT)
 
   def _GetLsblkDictZeroDisks(self):
     return {'blockdevices': []}
 
   def _GetLsblkDictThreeDisks(self):
-    return self._lsblk_dict
+    return self._LSBLK_DICT
 
   def testListDisksZero(self):
     recipe = disk.DiskRecipe('Disk')
@@ -218,7 +320,7 @@ class DiskRecipeTests(unittest.TestCase):
       with mock.patch(
           'auto_forensicate.recipes.disk.DiskRecipe._GetLsblkDict'
       ) as patched_lsblk:
-        patched_lsblk.return_value = self._lsblk_dict
+        patched_lsblk.return_value = self._LSBLK_DICT
         recipe = disk.DiskRecipe('Disk')
         recipe._platform = 'linux'
         artifacts = recipe.GetArtifacts()
@@ -234,7 +336,7 @@ class DiskRecipeTests(unittest.TestCase):
         self.assertIsInstance(lsblk_artifact, base.StringArtifact)
         self.assertEqual(
             lsblk_artifact._GetStream().read(),
-            json.dumps(self._lsblk_dict).encode('utf-8'))
+            self._LSBLK_JSON.encode('utf-8'))
         self.assertEqual(lsblk_artifact.remote_path, 'Disks/lsblk.txt')
 
         self.assertEqual(artifacts[2], disk_object)
@@ -245,6 +347,16 @@ class DiskRecipeTests(unittest.TestCase):
         self.assertEqual(
             file_artifact.remote_path, 'Disks/{0:s}.hash'.format(disk_name))
 
+  def testGetLsblkDictRunsOnce(self):
+    recipe = disk.DiskRecipe('Disk')
+    with mock.patch('subprocess.check_output') as patched_check_output:
+      patched_check_output.return_value = self._LSBLK_JSON
+      with mock.patch('auto_forensicate.hostinfo.Which') as patched_which:
+        patched_which.return_value = '/bin/lsblk'
+        self.assertEqual(recipe._GetLsblkDict(), self._LSBLK_DICT)
+        self.assertEqual(recipe._GetLsblkDict(), self._LSBLK_DICT)
+      patched_check_output.assert_called_once()
+
   def testIsMounted(self):
     recipe = disk.DiskRecipe('Disk')
     recipe._platform = 'linux'
@@ -328,6 +440,22 @@ class MacDiskArtifactTests(unittest.TestCase):
     disk_object = disk.MacDiskArtifact('/dev/diskUSB', 123456789)
     self.assertFalse(disk_object.ProbablyADisk())
 
+  @mock.patch('auto_forensicate.macdisk._DictFromDiskutilInfo')
+  @mock.patch('auto_forensicate.macdisk._DictFromDiskutilList')
+  def testListDisksRunsDiskutilOnce(self, patched_list_dict, patched_info_dict):
+    patched_list_dict.return_value = {
+        'WholeDisks': ['diskInternal', 'diskUSB']}
+    patched_info_dict.side_effect = lambda deviceid: dict(
+        self._fake_disk_infos[deviceid], DeviceIdentifier=deviceid,
+        TotalSize=123456789)
+    recipe = disk.DiskRecipe('Disk')
+    recipe._platform = 'darwin'
+    disks = recipe._ListDisks()
+    self.assertEqual([d.name for d in disks], ['diskInternal'])
+    recipe._GetListDisksArtifact()
+    patched_list_dict.assert_called_once()
+    self.assertEqual(patched_info_dict.call_count, 2)
+
   @mock.patch('auto_forensicate.macdisk._DictFromDiskutilInfo')
   @mock.patch('auto_forensicate.macdisk._DictFromDiskutilList')
   def testGetDescription(self, _patched_list_dict, _patched_info_dict):
@@ -16,6 +16,8 @@
 
 from __future__ import unicode_literals
 
+import os
+import tempfile
 import unittest
 import uuid
 import mock
@@ -68,3 +70,16 @@ class HostInfoTests(unittest.TestCase):
     uuid_ = uuid.uuid4()
     with mock.patch('uuid.uuid4', lambda: uuid_):
       self.assertEqual(hostinfo.GetIdentifier(), str(uuid_))
+
+  def testWhich(self):
+    with tempfile.TemporaryDirectory() as temp_dir:
+      binary_path = os.path.join(temp_dir, 'fake_binary')
+      with open(binary_path, 'w') as binary_file:
+        binary_file.write('#!/bin/sh\n')
+      os.chmod(binary_path, 0o755)
+
+      with mock.patch.dict('os.environ', {'PATH': temp_dir}):
+        self.assertEqual(hostinfo.Which('fake_binary'), binary_path)
+        self.assertIsNone(hostinfo.Which('not_a_binary'))
+      with mock.patch.dict('os.environ', {'PATH': '/nonexistent'}):
+        self.assertIsNone(hostinfo.Which('fake_binary'))
@@ -47,39 +47,37 @@ class LinuxSysinfoRecipeTest(unittest.TestCase):
 	    Family: 103C_55555X G=D
     """
 
-  def testGetArtifactsFail(self):
+  @mock.patch.object(base.ProcessOutputArtifact, '_RunCommand')
+  def testGetArtifactsFail(self, patched_run):
     sysinfo_recipe = sysinfo.SysinfoRecipe('failsysinfo')
     # pylint: disable=protected-access
     sysinfo_recipe._platform = 'linux'
-    # pylint: disable=line-too-long
-    with mock.patch('auto_forensicate.recipes.base.ProcessOutputArtifact._RunCommand') as patched_run:
-      patched_run.return_value = self._DMIDECODE_OUTPUT_FAIL_STRING
-      artifacts = sysinfo_recipe.GetArtifacts()
-      self.assertEqual(len(artifacts), 2)
-
-      artifact = artifacts[0]
-      self.assertIsInstance(artifact, base.ProcessOutputArtifact)
-      self.assertEqual(artifact.name, 'system_info.txt')
-      self.assertEqual(artifact.remote_path, 'system_info.txt')
-      artifact_content = artifact.OpenStream().read()
-      self.assertEqual(artifact_content, self._DMIDECODE_OUTPUT_FAIL_STRING)
-
-  def testGetArtifacts(self):
+    patched_run.return_value = self._DMIDECODE_OUTPUT_FAIL_STRING
+    artifacts = sysinfo_recipe.GetArtifacts()
+    self.assertEqual(len(artifacts), 2)
+
+    artifact = artifacts[0]
+    self.assertIsInstance(artifact, base.ProcessOutputArtifact)
+    self.assertEqual(artifact.name, 'system_info.txt')
+    self.assertEqual(artifact.remote_path, 'system_info.txt')
+    artifact_content = artifact.OpenStream().read()
+    self.assertEqual(artifact_content, self._DMIDECODE_OUTPUT_FAIL_STRING)
+
+  @mock.patch.object(base.ProcessOutputArtifact, '_RunCommand')
+  def testGetArtifacts(self, patched_run):
     sysinfo_recipe = sysinfo.SysinfoRecipe('sysinfo')
     # pylint: disable=protected-access
     sysinfo_recipe._platform = 'linux'
-    # pylint: disable=line-too-long
-    with mock.patch('auto_forensicate.recipes.base.ProcessOutputArtifact._RunCommand') as patched_run:
-      patched_run.return_value = self._DMIDECODE_OUTPUT_STRING
-      artifacts = sysinfo_recipe.GetArtifacts()
-      self.assertEqual(len(artifacts), 2)
+    patched_run.return_value = self._DMIDECODE_OUTPUT_STRING
+    artifacts = sysinfo_recipe.GetArtifacts()
+    self.assertEqual(len(artifacts), 2)
 
-      artifact = artifacts[0]
-      self.assertIsInstance(artifact, base.ProcessOutputArtifact)
-      self.assertEqual(artifact.name, 'system_info.txt')
-      self.assertEqual(artifact.remote_path, 'system_info.txt')
-      artifact_content = artifact.OpenStream().read()
-      self.assertEqual(artifact_content, self._DMIDECODE_OUTPUT_STRING)
+    artifact = artifacts[0]
+    self.assertIsInstance(artifact, base.ProcessOutputArtifact)
+    self.assertEqual(artifact.name, 'system_info.txt')
+    self.assertEqual(artifact.remote_path, 'system_info.txt')
+    artifact_content = artifact.OpenStream().read()
+    self.assertEqual(artifact_content, self._DMIDECODE_OUTPUT_STRING)
 
 
 class MacSysinfoRecipeTest(unittest.TestCase):
@@ -122,36 +120,34 @@ Software:
       Time since boot: 4 days 3:38
     """
 
-  def testGetArtifactsFail(self):
+  @mock.patch.object(base.ProcessOutputArtifact, '_RunCommand')
+  def testGetArtifactsFail(self, patched_run):
     sysinfo_recipe = sysinfo.SysinfoRecipe('failsysinfo')
     # pylint: disable=protected-access
     sysinfo_recipe._platform = 'darwin'
-    # pylint: disable=line-too-long
-    with mock.patch('auto_forensicate.recipes.base.ProcessOutputArtifact._RunCommand') as patched_run:
-      patched_run.return_value = self._SYSTEM_PROFILER_FAIL_STRING
-      artifacts = sysinfo_recipe.GetArtifacts()
-      self.assertEqual(len(artifacts), 2)
-
-      artifact = artifacts[0]
-      self.assertIsInstance(artifact, base.ProcessOutputArtifact)
-      self.assertEqual(artifact.name, 'system_info.txt')
-      self.assertEqual(artifact.remote_path, 'system_info.txt')
-      artifact_content = artifact.OpenStream().read()
-      self.assertEqual(artifact_content, self._SYSTEM_PROFILER_FAIL_STRING)
-
-  def testGetArtifacts(self):
+    patched_run.return_value = self._SYSTEM_PROFILER_FAIL_STRING
+    artifacts = sysinfo_recipe.GetArtifacts()
+    self.assertEqual(len(artifacts), 2)
+
+    artifact = artifacts[0]
+    self.assertIsInstance(artifact, base.ProcessOutputArtifact)
+    self.assertEqual(artifact.name, 'system_info.txt')
+    self.assertEqual(artifact.remote_path, 'system_info.txt')
+    artifact_content = artifact.OpenStream().read()
+    self.assertEqual(artifact_content, self._SYSTEM_PROFILER_FAIL_STRING)
+
+  @mock.patch.object(base.ProcessOutputArtifact, '_RunCommand')
+  def testGetArtifacts(self, patched_run):
     sysinfo_recipe = sysinfo.SysinfoRecipe('sysinfo')
     # pylint: disable=protected-access
     sysinfo_recipe._platform = 'darwin'
-    # pylint: disable=line-too-long
-    with mock.patch('auto_forensicate.recipes.base.ProcessOutputArtifact._RunCommand') as patched_run:
-      patched_run.return_value = self._SYSTEM_PROFILER_OUTPUT_STRING
-      artifacts = sysinfo_recipe.GetArtifacts()
-      self.assertEqual(len(artifacts), 2)
-
-      artifact = artifacts[0]
-      self.assertIsInstance(artifact, base.ProcessOutputArtifact)
-      self.assertEqual(artifact.name, 'system_info.txt')
-      self.assertEqual(artifact.remote_path, 'system_info.txt')
-      artifact_content = artifact.OpenStream().read()
-      self.assertEqual(artifact_content, self._SYSTEM_PROFILER_OUTPUT_STRING)
+    patched_run.return_value = self._SYSTEM_PROFILER_OUTPUT_STRING
+    artifacts = sysinfo_recipe.GetArtifacts()
+    self.assertEqual(len(artifacts), 2)
+
+    artifact = artifacts[0]
+    self.assertIsInstance(artifact, base.ProcessOutputArtifact)
+    self.assertEqual(artifact.name, 'system_info.txt')
+    self.assertEqual(artifact.remote_path, 'system_info.txt')
+    artifact_content = artifact.OpenStream().read()
+    self.assertEqual(artifact_content, self._SYSTEM_PROFILER_OUTPUT_STRING)
@@ -19,12 +19,15 @@ from __future__ import unicode_literals
 import argparse
 from collections import namedtuple
 import json
+import os
 try:
   from BytesIO import BytesIO
 except ImportError:
   from io import BytesIO
 import tempfile
+import threading
 import mmap
+import time
 import unittest
 
 import boto
@@ -54,6 +57,7 @@ FAKE_STAMP = FakeStamp(
     identifier='fake_uuid',
     start_time='20171012-135619'
 )
+FAKE_STAMP_JSON = json.dumps(FAKE_STAMP._asdict())
 
 FAKE_STAMP_NO_ASSET = FakeStamp(
     asset_tag=None,
@@ -124,7 +128,7 @@ class LocalCopierTests(unittest.TestCase):
 
     expected_stamp_path = (
         self.temp_dir+'/20171012-135619/fake_uuid/stamp.json')
-    expected_stamp_content = json.dumps(FAKE_STAMP._asdict())
+    expected_stamp_content = FAKE_STAMP_JSON
 
     result_path = uploader_object.UploadArtifact(test_artifact)
 
@@ -136,6 +140,24 @@ class LocalCopierTests(unittest.TestCase):
       self.assertEqual(expected_stamp_content, stamp_file.read())
 
 
+  def testUploadFileArtifact(self):
+    fake_data = bytes(range(0, 256)) * 1000
+    source_path = os.path.join(self.temp_dir, 'source_file')
+    with open(source_path, 'wb') as source_file:
+      source_file.write(fake_data)
+    test_artifact = base.FileArtifact(source_path)
+    update_callback = mock.Mock()
+
+    uploader_object = uploader.LocalCopier(
+        self.temp_dir, FakeStampManager(), stamp=FAKE_STAMP)
+    result_path = uploader_object.UploadArtifact(
+        test_artifact, update_callback=update_callback)
+
+    with open(result_path, 'rb') as artifact_file:
+      self.assertEqual(fake_data, artifact_file.read())
+    update_callback.assert_called_with(len(fake_data), len(fake_data))
+
+
 class LocalSplitterCopierTests(LocalCopierTests):
   """Tests for the LocalSplitterCopier class."""
 
@@ -164,25 +186,97 @@ class LocalSplitterCopierTests(LocalCopierTests):
     patched_getstream.return_value = temp
 
     uploader_object = uploader.LocalSplitterCopier(
-        '/fake_destination/', FakeStampManager(), slices=5)
+        '/fake_destination/', FakeStampManager(), slices=5, parallelism=2)
     patched_makeremotepath.return_value = '/fake_destination/sda.image'
     uploader_object._stamp_uploaded = True
 
     uploader_object.UploadArtifact(test_artifact, update_callback=mock.Mock())
 
+    # With parallelism > 1 slices are copied concurrently, so they can complete
+    # in any order.
     results = self._copied_streams
+    slice_paths = sorted(
+        results, key=lambda path: int(path.rsplit('_', 1)[1]))
     expected_slice_paths = [
         f'/fake_destination/sda.image_{x}'
         for x in range(0, len(results))]
-    self.assertEqual(list(results), expected_slice_paths)
+    self.assertEqual(slice_paths, expected_slice_paths)
 
     concatenated_data = bytearray()
-    for path in list(results):
+    for path in slice_paths:
       concatenated_data += results[path]
 
     self.assertEqual(concatenated_data, fake_data)
 
 
+class GetSlicesTests(unittest.TestCase):
+  """Tests for the _GetSlices function."""
+
+  def testGetSlices(self):
+    size = mmap.PAGESIZE * 10 + 12
+    slices = uploader._GetSlices(size, 3, 'sda.image')
+    self.assertEqual(slices, [
+        (0, 0, mmap.PAGESIZE * 3, 'sda.image_0'),
+        (1, mmap.PAGESIZE * 3, mmap.PAGESIZE * 3, 'sda.image_1'),
+        (2, mmap.PAGESIZE * 6, mmap.PAGESIZE * 3, 'sda.image_2'),
+        (3, mmap.PAGESIZE * 9, mmap.PAGESIZE + 12, 'sda.image_3'),
+    ])
+
+  def testGetSlicesSmallArtifact(self):
+    self.assertEqual(
+        uploader._GetSlices(100, 10, 'sda.image'),
+        [(0, 0, 100, 'sda.image_0')])
+
+  def testGetSlicesInvalid(self):
+    with self.assertRaises(errors.BadConfigOption):
+      uploader._GetSlices(100, 0, 'sda.image')
+
+
+class UploadSlicesTests(unittest.TestCase):
+  """Tests for the _UploadSlices function."""
+
+  def testUploadFailureCancelsPendingSlices(self):
+    started_slices = []
+
+    # pylint: disable=unused-argument
+    def _FakeUpload(stream, remote_path, update_callback=None):
+      started_slices.append(remote_path)
+      if remote_path.endswith('_1'):
+        raise errors.RetryableError('boom')
+      # The first slice is still uploading when the second one fails.
+      time.sleep(0.5)
+
+    with tempfile.TemporaryFile() as temp:
+      temp.write(b'A' * mmap.PAGESIZE * 5)
+      temp.flush()
+      test_artifact = mock.Mock(size=mmap.PAGESIZE * 5)
+      test_artifact.OpenStream.return_value = temp
+
+      with self.assertRaises(errors.RetryableError):
+        uploader._UploadSlices(_FakeUpload, test_artifact, 'sda.image', 5, 2)
+
+    # At most the slice picked up right after the failure has started.
+    self.assertLessEqual(len(started_slices), 3)
+    self.assertNotIn('sda.image_4', started_slices)
+
+
+class SlicedUploadProgressTests(unittest.TestCase):
+  """Tests for the SlicedUploadProgress class."""
+
+  def testSliceCallbacks(self):
+    update_callback = mock.Mock()
+    progress = uploader.SlicedUploadProgress(300, update_callback)
+    first_slice_callback = progress.GetSliceCallback(0)
+    second_slice_callback = progress.GetSliceCallback(1)
+
+    first_slice_callback(50, 150)
+    update_callback.assert_called_with(50, 300)
+    second_slice_callback(100, 150)
+    update_callback.assert_called_with(150, 300)
+    first_slice_callback(150, 150)
+    update_callback.assert_called_with(250, 300)
+
+
 class GCSUploaderTests(unittest.TestCase):
   """Tests for the GCSUploader class."""
 
@@ -216,27 +310,19 @@ class GCSUploaderTests(unittest.TestCase):
     self.assertEqual(remote_path, expected_remote_path)
 
   def testSplitGCSUrl(self):
-    self.gcs_url = 'gs://bucket_name/some/where'
-    uploader_object = uploader.GCSUploader(
-        self.gcs_url, 'fake_key.json', 'fake_clientid', FakeStampManager())
-    expected_tuple = ('bucket_name', 'some/where')
-    self.assertEqual(uploader_object._SplitGCSUrl(), expected_tuple)
-
-    self.gcs_url = 'gs://bucket_name'
-    uploader_object = uploader.GCSUploader(
-        self.gcs_url, 'fake_key.json', 'fake_clientid', FakeStampManager())
-    expected_tuple = ('bucket_name', '')
-    self.assertEqual(uploader_object._SplitGCSUrl(), expected_tuple)
-
-    self.gcs_url = 'gs://bucket_name/'
-    uploader_object = uploader.GCSUploader(
-        self.gcs_url, 'fake_key.json', 'fake_clientid', FakeStampManager())
-    expected_tuple = ('bucket_name', '')
-    self.assertEqual(uploader_object._SplitGCSUrl(), expected_tuple)
-
-    self.gcs_url = 'invalid'
     uploader_object = uploader.GCSUploader(
         self.gcs_url, 'fake_key.json', 'fake_clientid', FakeStampManager())
+    test_cases = [
+        ('gs://bucket_name/some/where', ('bucket_name', 'some/where')),
+        ('gs://bucket_name', ('bucket_name', '')),
+        ('gs://bucket_name/', ('bucket_name', '')),
+    ]
+    for gcs_url, expected_tuple in test_cases:
+      with self.subTest(gcs_url=gcs_url):
+        uploader_object._gs_url = gcs_url
+        self.assertEqual(uploader_object._SplitGCSUrl(), expected_tuple)
+
+    uploader_object._gs_url = 'invalid'
     with self.assertRaisesRegex(
         argparse.ArgumentError, 'Invalid GCS URL \'{0:s}\''.format('invalid')):
       uploader_object._SplitGCSUrl()
@@ -255,7 +341,7 @@ class GCSUploaderTests(unittest.TestCase):
         ('bucket_name/some/where/20171012-135619/fake_uuid/'
          'Base/test_artifact'): 'fake_content',
         ('bucket_name/some/where/20171012-135619/fake_uuid/'
-         'stamp.json'): json.dumps(FAKE_STAMP._asdict())
+         'stamp.json'): FAKE_STAMP_JSON
     }
 
     result_path = uploader_object.UploadArtifact(test_artifact)
@@ -329,14 +415,61 @@ class GCSSplitterUploaderTests(GCSUploaderTests):
 
     uploader_object.UploadArtifact(test_artifact, update_callback=mock.Mock())
 
+    # Slices are uploaded in parallel, so they can complete in any order.
     results = self._uploaded_streams
+    slice_paths = sorted(
+        results, key=lambda path: int(path.rsplit('_', 1)[1]))
     expected_slice_paths = [
         f'fake_bucket/20171012-135619/fake_uuid/Disks/sda.image_{x}'
         for x in range(0, len(results))]
-    self.assertEqual(list(results), expected_slice_paths)
+    self.assertEqual(slice_paths, expected_slice_paths)
 
     concatenated_data = bytearray()
-    for path in list(results):
+    for path in slice_paths:
       concatenated_data += results[path]
 
     self.assertEqual(concatenated_data, fake_data)
+
+  @mock.patch('boto.gs.connection.GSConnection')
+  @mock.patch.object(disk.DiskArtifact, '_GetStream')
+  def testUploadArtifactConnectionPerThread(
+      self, patched_getstream, patched_gsconnection):
+    """Tests that slices uploaded concurrently don't share a boto connection."""
+    slices = 4
+    # Makes sure all the slices are being uploaded at the same time.
+    all_slices_started = threading.Barrier(slices, timeout=5)
+    uploads = []
+
+    def _MakeConnection(*unused_args, **unused_kwargs):
+      connection = mock.Mock()
+
+      def _SetContents(stream, cb=None):  # pylint: disable=unused-argument
+        all_slices_started.wait()
+        uploads.append((stream.read(), connection))
+
+      key = connection.get_bucket.return_value.new_key.return_value
+      key.set_contents_from_stream.side_effect = _SetContents
+      return connection
+
+    patched_gsconnection.side_effect = _MakeConnection
+    fake_data = bytes(i % 251 for i in range(mmap.PAGESIZE * slices))
+    temp = tempfile.TemporaryFile()
+    temp.write(fake_data)
+    patched_getstream.return_value = temp
+    test_artifact = disk.DiskArtifact(
+        '/dev/sda', len(fake_data), use_dcfldd=False)
+
+    uploader_object = uploader.GCSSplitterUploader(
+        'gs://fake_bucket/', 'no_keyfile', 'client_id', FakeStampManager(),
+        slices=slices, parallelism=slices)
+    uploader_object._boto_configured = True
+    uploader_object._stamp_uploaded = True
+    uploader_object.UploadArtifact(test_artifact, update_callback=mock.Mock())
+
+    slice_size = len(fake_data) // slices
+    self.assertEqual(
+        sorted(data for data, _ in uploads),
+        sorted(fake_data[offset:offset + slice_size]
+               for offset in range(0, len(fake_data), slice_size)))
+    connections = set(id(connection) for _, connection in uploads)
+    self.assertEqual(len(connections), slices)
@@ -27,10 +27,9 @@ function ubuntu_remove_packages {
 
 function install_forensication_tools {
   readonly local CHIPSEC_PKG=( python3-dev libffi-dev build-essential gcc nasm )
-  readonly local FORENSIC_PKG=( dcfldd )
 
   # install common utils
-  apt-get -y install "${FORENSIC_PKG[@]}" "${CHIPSEC_PKG[@]}"
+  apt-get -y install "${CHIPSEC_PKG[@]}"
 }
 
 function install_basic_pkg {